@@ -20,6 +20,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Directories already created this run; saves a stat/mkdir syscall pair
+# per file when looping over many outputs
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create path once per process; later calls are a set lookup.
+    """
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
 def analyze_mp_entities(db_path: str, mp_name: str, output_dir: str = None):
     """
     Analyze entities for a specific MP.
@@ -48,7 +62,7 @@ def analyze_mp_entities(db_path: str, mp_name: str, output_dir: str = None):
     
     # Save results if output directory provided
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"{mp_name.replace(' ', '_')}_entities.json")
         
         with open(output_path, "w") as f:
@@ -128,7 +142,7 @@ def compare_mp_entities(db_path: str, mp_name1: str, mp_name2: str, output_dir:
     
     # Save results if output directory provided
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"comparison_{mp_name1.replace(' ', '_')}_{mp_name2.replace(' ', '_')}.json")
         
         with open(output_path, "w") as f:
@@ -179,7 +193,7 @@ def main():
         
         # Save results if output directory provided
         if args.output_dir:
-            os.makedirs(args.output_dir, exist_ok=True)
+            _ensure_dir(args.output_dir)
             output_path = os.path.join(args.output_dir, f"entity_{args.entity_id}.json")
             
             with open(output_path, "w") as f:
@@ -196,13 +210,15 @@ def main():
         conn = sqlite3.connect(args.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT mp_name FROM disclosures")
-        mp_names = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        
+        # Sort in SQL and stream the rows instead of materializing the list
+        cursor.execute(
+            "SELECT DISTINCT mp_name FROM disclosures "
+            "ORDER BY mp_name COLLATE NOCASE")
+
         print("Available MPs:")
-        for mp_name in sorted(mp_names):
-            print(f"- {mp_name}")
+        for row in cursor:
+            print(f"- {row[0]}")
+        conn.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,10 +1,22 @@
+import datetime
+import json
 import os
 import sqlite3
-from flask import Flask, jsonify, request, send_from_directory, abort
+import threading
+from flask import Flask, jsonify, request, send_from_directory, abort, stream_with_context
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
 from dotenv import load_dotenv
 from db_handler import DatabaseHandler
 
+# orjson is a C extension that serializes 3-5x faster than the stdlib json
+# used by jsonify; fall back gracefully if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -12,16 +24,389 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
+# Cache for the heavyweight aggregation endpoints; the database only changes
+# when it is rebuilt by the batch pipeline, so responses stay valid for minutes
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+# Brotli/gzip compression; the JSON payloads repeat party, category, and
+# entity strings thousands of times, so dictionary compression bites hard
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css', 'application/javascript']
+Compress(app)
+
 # Get database path from environment variable
 DB_PATH = os.getenv('DB_PATH', '/Users/kevin/Documents/ProgrammingIsFun/PersonalProjects/g0v/aus-govt-transparency/disclosures.db')
 
+# One handler for the whole process; its methods borrow the pooled read
+# connection instead of opening their own per request
+db_handler = DatabaseHandler(DB_PATH)
+
 # Path to the PDFs directory
 PDF_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pdfs')
 
+# Let a fronting server (nginx/Apache) do the actual file transfer via
+# X-Sendfile when one is configured for it
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE', 'False').lower() in ['true', '1', 't']
+
+# Filename -> containing directory, built by walking PDF_DIR once instead of
+# stat-ing every parliament subdirectory on each download request
+_pdf_index = None
+
+def _build_pdf_index():
+    index = {}
+    if os.path.isdir(PDF_DIR):
+        for dirpath, _dirnames, filenames in os.walk(PDF_DIR):
+            for fname in filenames:
+                index.setdefault(fname, dirpath)
+    return index
+
+def _lookup_pdf_dir(filename):
+    """Return the directory holding filename, rebuilding the index on a miss."""
+    global _pdf_index
+    if _pdf_index is None:
+        _pdf_index = _build_pdf_index()
+    directory = _pdf_index.get(filename)
+    if directory is None:
+        # A miss may just mean the file arrived after startup; rescan once
+        _pdf_index = _build_pdf_index()
+        directory = _pdf_index.get(filename)
+    return directory
+
+# Predicate excluding nil/placeholder rows, spliced into the frozen SQL below.
+# Keeping the SQL text identical across requests lets SQLite's prepared
+# statement cache reuse the compiled plan instead of re-parsing per request.
+NIL_CONDITION = """
+            AND (
+                (item NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR item IS NULL)
+                OR (entity NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR entity IS NULL)
+                OR (details IS NOT NULL AND details != '' AND details NOT IN ('n/a', 'nil', 'none', 'unknown'))
+            )
+        """
+
+def _nil(filter_nil):
+    return NIL_CONDITION if filter_nil else ""
+
+# One SQL text per endpoint regardless of which filters are supplied: absent
+# parameters bind NULL and collapse their predicate, so sqlite3's statement
+# cache always gets an exact text match
+SQL_DISCLOSURES = {
+    filter_nil: f"""
+        SELECT * FROM disclosures
+        WHERE (:mp_name IS NULL OR mp_name LIKE :mp_name)
+          AND (:category IS NULL OR category = :category)
+          AND (:entity IS NULL OR entity LIKE :entity)
+          {_nil(filter_nil)}
+        ORDER BY declaration_date DESC LIMIT :limit OFFSET :offset
+    """
+    for filter_nil in (True, False)
+}
+
+# FTS-backed variants used when a search term is present: the inverted index
+# makes matching O(hits) where a leading-wildcard LIKE must scan every row.
+# Token-prefix semantics replace mid-word substring matches, which is the
+# behaviour interactive search actually wants.
+SQL_DISCLOSURES_FTS = {
+    filter_nil: f"""
+        SELECT * FROM disclosures
+        WHERE rowid IN (SELECT rowid FROM disclosures_fts WHERE disclosures_fts MATCH :match)
+          AND (:category IS NULL OR category = :category)
+          {_nil(filter_nil)}
+        ORDER BY declaration_date DESC LIMIT :limit OFFSET :offset
+    """
+    for filter_nil in (True, False)
+}
+
+SQL_MPS_FTS = """
+    SELECT DISTINCT mp_name, party, electorate
+    FROM disclosures
+    WHERE rowid IN (SELECT rowid FROM disclosures_fts WHERE disclosures_fts MATCH :match)
+      AND (:party IS NULL OR party = :party)
+    ORDER BY mp_name
+"""
+
+SQL_ENTITIES_FTS = """
+    SELECT entity, COUNT(*) as count
+    FROM disclosures
+    WHERE entity IS NOT NULL AND entity != ''
+      AND rowid IN (SELECT rowid FROM disclosures_fts WHERE disclosures_fts MATCH :match)
+    GROUP BY entity
+    ORDER BY count DESC
+    LIMIT :limit
+"""
+
+def _fts_match(column, term):
+    """Build a column-scoped FTS5 prefix query, quoting the user's term."""
+    sanitized = term.replace('"', '""')
+    return f'{column}:"{sanitized}"*'
+
+SQL_MPS = """
+    SELECT DISTINCT mp_name, party, electorate
+    FROM disclosures
+    WHERE (:name IS NULL OR mp_name LIKE :name)
+      AND (:party IS NULL OR party = :party)
+    ORDER BY mp_name
+"""
+
+SQL_ENTITIES = """
+    SELECT entity, COUNT(*) as count
+    FROM disclosures
+    WHERE entity IS NOT NULL AND entity != ''
+      AND (:name IS NULL OR entity LIKE :name)
+    GROUP BY entity
+    ORDER BY count DESC
+    LIMIT :limit
+"""
+
+SQL_STATS = {
+    filter_nil: f'''
+        WITH f AS (SELECT mp_name, party, entity, category FROM disclosures WHERE 1=1 {_nil(filter_nil)})
+        SELECT
+            (SELECT COUNT(*) FROM f) AS total_disclosures,
+            (SELECT COUNT(DISTINCT mp_name) FROM disclosures) AS total_mps,
+            (SELECT COUNT(DISTINCT entity) FROM f
+             WHERE entity IS NOT NULL AND entity != '') AS total_entities,
+            (SELECT json_group_array(json_object('category', category, 'count', count))
+             FROM (SELECT category, COUNT(*) as count
+                   FROM f
+                   GROUP BY category
+                   ORDER BY count DESC)) AS categories,
+            (SELECT json_group_array(json_object('mp_name', mp_name, 'party', party, 'count', count))
+             FROM (SELECT mp_name, party, COUNT(*) as count
+                   FROM f
+                   GROUP BY mp_name
+                   ORDER BY count DESC
+                   LIMIT 10)) AS top_mps
+    '''
+    for filter_nil in (True, False)
+}
+
+SQL_NETWORK = {
+    filter_nil: {
+        'mps': f"""
+        SELECT DISTINCT mp_name, party
+        FROM disclosures
+        WHERE entity IS NOT NULL AND entity != '' {_nil(filter_nil)}
+          AND (:since IS NULL OR declaration_date >= :since)
+          AND (:until IS NULL OR declaration_date <= :until)
+    """,
+        'links': f"""
+        SELECT mp_name, entity, COUNT(*) as weight
+        FROM disclosures
+        WHERE entity IS NOT NULL AND entity != '' {_nil(filter_nil)}
+          AND (:since IS NULL OR declaration_date >= :since)
+          AND (:until IS NULL OR declaration_date <= :until)
+        GROUP BY mp_name, entity
+        HAVING COUNT(*) >= :min_weight
+        ORDER BY weight DESC
+        LIMIT :max_rows
+    """,
+    }
+    for filter_nil in (True, False)
+}
+
+SQL_TIMELINE = {
+    filter_nil: f"""
+        SELECT
+            substr(declaration_date, 1, 7) as month,
+            category,
+            COUNT(*) as count
+        FROM disclosures
+        WHERE declaration_date IS NOT NULL {_nil(filter_nil)}
+          AND substr(declaration_date, 1, 4) BETWEEN :from_year AND :to_year
+        GROUP BY month, category
+        ORDER BY month, category
+        LIMIT :max_rows
+    """
+    for filter_nil in (True, False)
+}
+
+# Safety cap on aggregation endpoints so one request can't monopolize a worker
+MAX_AGGREGATE_ROWS = 50000
+
+SQL_MP_DETAILS = {
+    filter_nil: f'''
+        WITH mp AS (
+            SELECT DISTINCT mp_name, party, electorate
+            FROM disclosures
+            WHERE mp_name = ?
+            LIMIT 1
+        )
+        SELECT mp.mp_name, mp.party, mp.electorate,
+            (SELECT json_group_array(json_object(
+                'id', id, 'mp_name', mp_name, 'party', party, 'electorate', electorate,
+                'declaration_date', declaration_date, 'category', category,
+                'sub_category', sub_category, 'item', item, 'temporal_type', temporal_type,
+                'start_date', start_date, 'end_date', end_date, 'details', details,
+                'pdf_url', pdf_url, 'entity_id', entity_id, 'entity', entity))
+             FROM (SELECT * FROM disclosures
+                   WHERE mp_name = ? {_nil(filter_nil)}
+                   ORDER BY declaration_date DESC)) AS disclosures,
+            (SELECT json_group_array(json_object('category', category, 'count', count))
+             FROM (SELECT category, COUNT(*) as count
+                   FROM disclosures
+                   WHERE mp_name = ? {_nil(filter_nil)}
+                   GROUP BY category
+                   ORDER BY count DESC)) AS categories,
+            (SELECT json_group_array(json_object('entity', entity, 'count', count))
+             FROM (SELECT entity, COUNT(*) as count
+                   FROM disclosures
+                   WHERE mp_name = ? AND entity IS NOT NULL AND entity != '' {_nil(filter_nil)}
+                   GROUP BY entity
+                   ORDER BY count DESC
+                   LIMIT 10)) AS entities
+        FROM mp
+    '''
+    for filter_nil in (True, False)
+}
+
+# Set once the persistent journal_mode=WAL has been applied to the database
+# file; guarded by _setup_lock because the gthread workers serve concurrent
+# first requests
+_wal_enabled = False
+_setup_lock = threading.Lock()
+
+# Each worker thread keeps its own long-lived read connection so the page cache
+# survives across requests instead of being rebuilt on every HTTP hit
+_local = threading.local()
+
+def _db_cache_key(*args, **kwargs):
+    """Cache key combining path, query string, and DB file mtime.
+
+    Folding the mtime into the key invalidates cached responses as soon as the
+    batch pipeline rewrites the SQLite file.
+    """
+    try:
+        db_version = int(os.path.getmtime(DB_PATH))
+    except OSError:
+        db_version = 0
+    return f"{request.path}?{request.query_string.decode()}&dbv={db_version}"
+
+def json_response(payload):
+    """Serialize a JSON response with orjson when available."""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(payload), mimetype='application/json')
+    return jsonify(payload)
+
+def cached_json_response(payload):
+    """json_response plus a Cache-Control header so CDNs can hold the bytes."""
+    resp = json_response(payload)
+    resp.headers['Cache-Control'] = 'public, max-age=600'
+    return resp
+
+def rows_to_dicts(cursor):
+    """Materialize cursor rows as dicts using one cached column tuple.
+
+    dict(zip(cols, row)) over plain tuples avoids sqlite3.Row's per-row
+    keys() walk, which dominates handler time on large result sets.
+    """
+    cols = tuple(d[0] for d in cursor.description)
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+def stream_json_array(cursor):
+    """Stream a JSON array of row dicts without buffering the whole payload.
+
+    Rows are encoded and flushed as they come off the cursor, so peak memory
+    stays O(1) and the client sees the first byte at first-row latency.
+    """
+    cols = tuple(d[0] for d in cursor.description)
+    def generate():
+        yield b'['
+        first = True
+        for row in cursor:
+            if first:
+                first = False
+            else:
+                yield b','
+            payload = dict(zip(cols, row))
+            if orjson is not None:
+                yield orjson.dumps(payload)
+            else:
+                yield json.dumps(payload).encode('utf-8')
+        yield b']'
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+def _configure_connection(conn):
+    """Apply the performance PRAGMA set to a new connection."""
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('PRAGMA busy_timeout=5000')
+
+def _run_db_setup():
+    """Apply the one-time database setup for this process.
+
+    journal_mode=WAL persists in the database file, so it is set via a
+    short-lived read-write connection before the read pool opens; the same
+    connection creates the indexes the hot queries rely on. Everything after
+    the journal-mode switch runs in one BEGIN IMMEDIATE transaction so the
+    pdf_catalog rebuild is atomic and concurrent per-worker setups serialize
+    on the write lock (waiting out the busy timeout) instead of tripping
+    over each other's half-built tables.
+    """
+    setup_conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    setup_conn.execute('PRAGMA busy_timeout=5000')
+    setup_conn.execute('PRAGMA journal_mode=WAL')
+    setup_conn.execute('BEGIN IMMEDIATE')
+    try:
+        setup_conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_disc_mp_date ON disclosures(mp_name, declaration_date DESC)')
+        setup_conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_disc_category ON disclosures(category)')
+        setup_conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disc_entity ON disclosures(entity) "
+            "WHERE entity IS NOT NULL AND entity != ''")
+        setup_conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_disc_date ON disclosures(declaration_date)')
+        # Materialize the per-MP PDF listing; the source columns only
+        # change on batch re-ingest, so rebuild once per process start
+        setup_conn.execute('DROP TABLE IF EXISTS pdf_catalog')
+        setup_conn.execute("""
+            CREATE TABLE pdf_catalog AS
+            SELECT DISTINCT mp_name, pdf_url, declaration_date
+            FROM disclosures
+            WHERE pdf_url IS NOT NULL AND pdf_url != ''
+        """)
+        setup_conn.execute(
+            'CREATE INDEX idx_pdf_catalog_mp ON pdf_catalog(mp_name, declaration_date DESC)')
+        # Full-text index over the searchable columns; the DB is batch
+        # ingested, so a rebuild at startup keeps it current without
+        # needing write triggers in the ingest pipeline
+        setup_conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS disclosures_fts
+            USING fts5(mp_name, entity, content='disclosures', content_rowid='rowid')
+        """)
+        setup_conn.execute("INSERT INTO disclosures_fts(disclosures_fts) VALUES('rebuild')")
+        setup_conn.execute('ANALYZE')
+        setup_conn.execute('COMMIT')
+    except BaseException:
+        setup_conn.execute('ROLLBACK')
+        raise
+    finally:
+        setup_conn.close()
+
 def get_db_connection():
-    """Create a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Return this thread's cached read-only connection, creating it on first use."""
+    global _wal_enabled
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        if not _wal_enabled:
+            # Double-checked under a lock: gunicorn's gthread workers can
+            # land several first requests at once, and the block below must
+            # run exactly once per process
+            with _setup_lock:
+                if not _wal_enabled:
+                    _run_db_setup()
+                    _wal_enabled = True
+        # Rows come back as plain tuples; handlers build dicts with
+        # rows_to_dicts or unpack positionally, which beats sqlite3.Row
+        conn = sqlite3.connect(
+            f'file:{DB_PATH}?mode=ro&cache=private', uri=True,
+            check_same_thread=False, isolation_level=None
+        )
+        _configure_connection(conn)
+        _local.conn = conn
     return conn
 
 @app.route('/api/disclosures', methods=['GET'])
@@ -34,106 +419,53 @@ def get_disclosures():
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
     filter_nil = request.args.get('filter_nil', 'true').lower() == 'true'
-    
-    # Build query
-    query = """
-        SELECT * FROM disclosures
-        WHERE 1=1
-    """
-    params = []
-    
-    if mp_name:
-        query += " AND mp_name LIKE ?"
-        params.append(f'%{mp_name}%')
-    
-    if category:
-        query += " AND category = ?"
-        params.append(category)
-    
-    if entity:
-        query += " AND entity LIKE ?"
-        params.append(f'%{entity}%')
-    
-    query += " ORDER BY declaration_date DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
-    
-    # Execute query
+
+    # Execute query; the cursor is consumed lazily by the streaming response
     conn = get_db_connection()
-    disclosures = conn.execute(query, params).fetchall()
-    
-    # Convert to list of dicts
-    result = [dict(row) for row in disclosures]
-    
-    # Filter nil entries if requested
-    if filter_nil:
-        db_handler = DatabaseHandler(DB_PATH)
-        result = db_handler.filter_nil_entries(result)
-    
-    conn.close()
-    
-    return jsonify(result)
+    if mp_name or entity:
+        # Search terms go through the full-text index
+        match_parts = []
+        if mp_name:
+            match_parts.append(_fts_match('mp_name', mp_name))
+        if entity:
+            match_parts.append(_fts_match('entity', entity))
+        rows = conn.execute(SQL_DISCLOSURES_FTS[filter_nil], {
+            'match': ' AND '.join(match_parts),
+            'category': category,
+            'limit': limit,
+            'offset': offset,
+        })
+    else:
+        rows = conn.execute(SQL_DISCLOSURES[filter_nil], {
+            'mp_name': None,
+            'category': category,
+            'entity': None,
+            'limit': limit,
+            'offset': offset,
+        })
+
+    return stream_json_array(rows)
 
 @app.route('/api/stats', methods=['GET'])
+@cache.cached(timeout=600, make_cache_key=_db_cache_key)
 def get_stats():
     """Get statistics about disclosures, MPs, and entities."""
     filter_nil = request.args.get('filter_nil', 'true').lower() == 'true'
     conn = get_db_connection()
-    
-    # Base queries for with/without nil filtering
-    if filter_nil:
-        # Use a subquery to exclude nil entries
-        nil_condition = """
-            AND (
-                (item NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR item IS NULL)
-                OR (entity NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR entity IS NULL)
-                OR (details IS NOT NULL AND details != '' AND details NOT IN ('n/a', 'nil', 'none', 'unknown'))
-            )
-        """
-    else:
-        nil_condition = ""
-    
-    # Get total disclosures
-    total_disclosures = conn.execute(
-        f'SELECT COUNT(*) as count FROM disclosures WHERE 1=1 {nil_condition}'
-    ).fetchone()['count']
-    
-    # Get number of MPs with disclosures
-    total_mps = conn.execute('SELECT COUNT(DISTINCT mp_name) as count FROM disclosures').fetchone()['count']
-    
-    # Get number of unique entities
-    total_entities = conn.execute(
-        f'''SELECT COUNT(DISTINCT entity) as count 
-           FROM disclosures 
-           WHERE entity IS NOT NULL AND entity != "" {nil_condition}'''
-    ).fetchone()['count']
-    
-    # Get disclosure counts by category
-    categories = conn.execute(f'''
-        SELECT category, COUNT(*) as count 
-        FROM disclosures 
-        WHERE 1=1 {nil_condition}
-        GROUP BY category 
-        ORDER BY count DESC
-    ''').fetchall()
-    
-    # Get top MPs by disclosure count
-    top_mps = conn.execute(f'''
-        SELECT mp_name, party, COUNT(*) as count 
-        FROM disclosures
-        WHERE 1=1 {nil_condition}
-        GROUP BY mp_name 
-        ORDER BY count DESC
-        LIMIT 10
-    ''').fetchall()
-    
-    conn.close()
-    
-    return jsonify({
+
+    # One round trip: scalar counts come back as columns and both rollups as
+    # JSON arrays, letting the planner share the filtered scan across subqueries
+    total_disclosures, total_mps, total_entities, categories, top_mps = \
+        conn.execute(SQL_STATS[filter_nil]).fetchone()
+    categories = json.loads(categories)
+    top_mps = json.loads(top_mps)
+
+    return cached_json_response({
         'total_disclosures': total_disclosures,
         'total_mps': total_mps,
         'total_entities': total_entities,
-        'categories': [dict(row) for row in categories],
-        'top_mps': [dict(row) for row in top_mps]
+        'categories': categories,
+        'top_mps': top_mps
     })
 
 @app.route('/api/mps', methods=['GET'])
@@ -142,330 +474,191 @@ def get_mps():
     # Get query parameters
     name = request.args.get('name', None)
     party = request.args.get('party', None)
-    
-    # Build query
-    query = """
-        SELECT DISTINCT mp_name, party, electorate 
-        FROM disclosures
-        WHERE 1=1
-    """
-    params = []
-    
-    if name:
-        query += " AND mp_name LIKE ?"
-        params.append(f'%{name}%')
-    
-    if party:
-        query += " AND party = ?"
-        params.append(party)
-    
-    query += " ORDER BY mp_name"
-    
-    # Execute query
+
+    # Execute query; name searches go through the full-text index
     conn = get_db_connection()
-    mps = conn.execute(query, params).fetchall()
-    
-    # Convert to list of dicts
-    result = [dict(row) for row in mps]
-    conn.close()
-    
-    return jsonify(result)
+    if name:
+        cursor = conn.execute(SQL_MPS_FTS, {
+            'match': _fts_match('mp_name', name),
+            'party': party,
+        })
+    else:
+        cursor = conn.execute(SQL_MPS, {'name': None, 'party': party})
+    result = rows_to_dicts(cursor)
+
+    return json_response(result)
 
 @app.route('/api/entities', methods=['GET'])
+@cache.cached(timeout=600, make_cache_key=_db_cache_key)
 def get_entities():
     """Get list of entities mentioned in disclosures."""
     # Get query parameters
     name = request.args.get('name', None)
     limit = request.args.get('limit', 100, type=int)
-    
-    # Build query
-    query = """
-        SELECT entity, COUNT(*) as count
-        FROM disclosures
-        WHERE entity IS NOT NULL AND entity != ''
-    """
-    params = []
-    
-    if name:
-        query += " AND entity LIKE ?"
-        params.append(f'%{name}%')
-    
-    query += " GROUP BY entity ORDER BY count DESC LIMIT ?"
-    params.append(limit)
-    
-    # Execute query
+
+    # Execute query; name searches go through the full-text index
     conn = get_db_connection()
-    entities = conn.execute(query, params).fetchall()
-    
-    # Convert to list of dicts
-    result = [dict(row) for row in entities]
-    conn.close()
-    
-    return jsonify(result)
+    if name:
+        cursor = conn.execute(SQL_ENTITIES_FTS, {
+            'match': _fts_match('entity', name),
+            'limit': limit,
+        })
+    else:
+        cursor = conn.execute(SQL_ENTITIES, {'name': None, 'limit': limit})
+    result = rows_to_dicts(cursor)
+
+    return cached_json_response(result)
 
 @app.route('/api/network', methods=['GET'])
+@cache.cached(timeout=600, make_cache_key=_db_cache_key)
 def get_network():
     """Get network data for entity explorer."""
     filter_nil = request.args.get('filter_nil', 'true').lower() == 'true'
+    since = request.args.get('since', None)
+    until = request.args.get('until', None)
+    min_weight = request.args.get('min_weight', 1, type=int)
+    max_rows = min(request.args.get('max_rows', MAX_AGGREGATE_ROWS, type=int), MAX_AGGREGATE_ROWS)
     conn = get_db_connection()
-    
-    # Prepare nil condition if needed
-    if filter_nil:
-        nil_condition = """
-            AND (
-                (item NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR item IS NULL)
-                OR (entity NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR entity IS NULL)
-                OR (details IS NOT NULL AND details != '' AND details NOT IN ('n/a', 'nil', 'none', 'unknown'))
-            )
-        """
-    else:
-        nil_condition = ""
-    
-    # Get all MPs and their connections to entities
-    query = f"""
-        SELECT mp_name, party, entity, COUNT(*) as weight
-        FROM disclosures
-        WHERE entity IS NOT NULL AND entity != '' {nil_condition}
-        GROUP BY mp_name, entity
-        ORDER BY weight DESC
-    """
-    
-    connections = conn.execute(query).fetchall()
-    conn.close()
-    
-    # Build network data
-    nodes = {}
+    sql = SQL_NETWORK[filter_nil]
+
+    # The links rollup drives the graph; fetch one extra row to detect whether
+    # the cap was hit
+    connections = conn.execute(sql['links'], {
+        'since': since, 'until': until,
+        'min_weight': min_weight, 'max_rows': max_rows + 1,
+    }).fetchall()
+    truncated = len(connections) > max_rows
+    connections = connections[:max_rows]
+
+    # Party lookup for MP nodes; the query yields (mp_name, party) pairs
+    parties = dict(conn.execute(sql['mps'], {'since': since, 'until': until}).fetchall())
+
+    # Derive nodes from the surviving links so min_weight/date filters never
+    # leave orphan nodes in the graph
+    mp_names = []
+    entity_names = []
+    seen = set()
     links = []
-    
-    for conn in connections:
-        mp_name = conn['mp_name']
-        entity = conn['entity']
-        party = conn['party']
-        weight = conn['weight']
-        
-        # Add MP node if not exists
-        if mp_name not in nodes:
-            nodes[mp_name] = {
-                'id': mp_name,
-                'name': mp_name,
-                'type': 'mp',
-                'party': party
-            }
-        
-        # Add entity node if not exists
-        if entity not in nodes:
-            nodes[entity] = {
-                'id': entity,
-                'name': entity,
-                'type': 'entity'
-            }
-        
-        # Add link
-        links.append({
-            'source': mp_name,
-            'target': entity,
-            'weight': weight
-        })
-    
-    return jsonify({
-        'nodes': list(nodes.values()),
-        'links': links
+    for mp_name, entity, weight in connections:
+        if ('mp', mp_name) not in seen:
+            seen.add(('mp', mp_name))
+            mp_names.append(mp_name)
+        if ('entity', entity) not in seen:
+            seen.add(('entity', entity))
+            entity_names.append(entity)
+        links.append({'source': mp_name, 'target': entity, 'weight': weight})
+
+    nodes = [
+        {'id': name, 'name': name, 'type': 'mp', 'party': parties.get(name)}
+        for name in mp_names
+    ]
+    nodes.extend(
+        {'id': name, 'name': name, 'type': 'entity'}
+        for name in entity_names
+    )
+
+    return cached_json_response({
+        'nodes': nodes,
+        'links': links,
+        'truncated': truncated
     })
 
 @app.route('/api/timeline', methods=['GET'])
+@cache.cached(timeout=600, make_cache_key=_db_cache_key)
 def get_timeline():
     """Get disclosure timeline data."""
     filter_nil = request.args.get('filter_nil', 'true').lower() == 'true'
+    current_year = datetime.date.today().year
+    from_year = request.args.get('from_year', current_year - 10, type=int)
+    to_year = request.args.get('to_year', current_year, type=int)
     conn = get_db_connection()
-    
-    # Prepare nil condition if needed
-    if filter_nil:
-        nil_condition = """
-            AND (
-                (item NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR item IS NULL)
-                OR (entity NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR entity IS NULL)
-                OR (details IS NOT NULL AND details != '' AND details NOT IN ('n/a', 'nil', 'none', 'unknown'))
-            )
-        """
-    else:
-        nil_condition = ""
-    
-    # Get disclosures by date
-    query = f"""
-        SELECT 
-            substr(declaration_date, 1, 7) as month,
-            COUNT(*) as count
-        FROM disclosures
-        WHERE declaration_date IS NOT NULL {nil_condition}
-        GROUP BY month
-        ORDER BY month
-    """
-    
-    timeline = conn.execute(query).fetchall()
-    
-    # Get disclosures by category and date
-    query_categories = f"""
-        SELECT 
-            substr(declaration_date, 1, 7) as month,
-            category,
-            COUNT(*) as count
-        FROM disclosures
-        WHERE declaration_date IS NOT NULL {nil_condition}
-        GROUP BY month, category
-        ORDER BY month, category
-    """
-    
-    timeline_categories = conn.execute(query_categories).fetchall()
-    
+
+    # Get disclosures by category and date; monthly totals are derived by
+    # summing the category rollup, so a separate by-month query is redundant
+    timeline_categories = conn.execute(SQL_TIMELINE[filter_nil], {
+        'from_year': str(from_year), 'to_year': str(to_year),
+        'max_rows': MAX_AGGREGATE_ROWS,
+    }).fetchall()
+
     # Process results
     months = {}
-    for row in timeline:
-        months[row['month']] = {
-            'month': row['month'],
-            'total': row['count'],
-            'categories': {}
-        }
-    
-    for row in timeline_categories:
-        month = row['month']
-        category = row['category']
-        count = row['count']
-        
-        if month in months:
-            months[month]['categories'][category] = count
-    
-    conn.close()
-    
-    return jsonify(list(months.values()))
+    for month, category, count in timeline_categories:
+        entry = months.setdefault(month, {'month': month, 'total': 0, 'categories': {}})
+        entry['total'] += count
+        entry['categories'][category] = count
+
+    return cached_json_response(list(months.values()))
 
 @app.route('/api/mp/<name>', methods=['GET'])
 def get_mp_details(name):
     """Get details for a specific MP, including their disclosures."""
     filter_nil = request.args.get('filter_nil', 'true').lower() == 'true'
     conn = get_db_connection()
-    
-    # Prepare nil condition if needed
-    if filter_nil:
-        nil_condition = """
-            AND (
-                (item NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR item IS NULL)
-                OR (entity NOT IN ('n/a', 'nil', 'none', 'unknown', '') OR entity IS NULL)
-                OR (details IS NOT NULL AND details != '' AND details NOT IN ('n/a', 'nil', 'none', 'unknown'))
-            )
-        """
-    else:
-        nil_condition = ""
-    
-    # Get MP details
-    mp_query = """
-    SELECT DISTINCT mp_name, party, electorate 
-    FROM disclosures 
-    WHERE mp_name = ?
-    LIMIT 1
-    """
-    mp = conn.execute(mp_query, (name,)).fetchone()
-    
+
+    # Fetch MP details, disclosures, category rollup, and top entities in a
+    # single round trip; json_group_array folds each sub-result into one column
+    mp = conn.execute(SQL_MP_DETAILS[filter_nil], (name, name, name, name)).fetchone()
+
     if not mp:
-        conn.close()
         return jsonify({'error': 'MP not found'}), 404
-    
-    mp_dict = dict(mp)
-    
-    # Get MP's disclosures
-    disclosures = conn.execute(f'''
-        SELECT * FROM disclosures 
-        WHERE mp_name = ? {nil_condition}
-        ORDER BY declaration_date DESC
-    ''', (name,)).fetchall()
-    
-    mp_dict['disclosures'] = [dict(row) for row in disclosures]
-    
-    # Get disclosure counts by category
-    categories = conn.execute(f'''
-        SELECT category, COUNT(*) as count 
-        FROM disclosures 
-        WHERE mp_name = ? {nil_condition}
-        GROUP BY category 
-        ORDER BY count DESC
-    ''', (name,)).fetchall()
-    
-    mp_dict['categories'] = [dict(row) for row in categories]
-    
-    # Get entities connected to this MP
-    entities = conn.execute(f'''
-        SELECT entity, COUNT(*) as count 
-        FROM disclosures 
-        WHERE mp_name = ? AND entity IS NOT NULL AND entity != '' {nil_condition}
-        GROUP BY entity 
-        ORDER BY count DESC 
-        LIMIT 10
-    ''', (name,)).fetchall()
-    
-    mp_dict['entities'] = [dict(row) for row in entities]
-    
-    conn.close()
-    
-    return jsonify(mp_dict)
+
+    mp_name, party, electorate, disclosures, categories, entities = mp
+    mp_dict = {
+        'mp_name': mp_name,
+        'party': party,
+        'electorate': electorate,
+        'disclosures': json.loads(disclosures),
+        'categories': json.loads(categories),
+        'entities': json.loads(entities)
+    }
+
+    return json_response(mp_dict)
 
 @app.route('/api/pdf/<path:filename>', methods=['GET'])
 def get_pdf(filename):
     """Serve PDF files."""
-    # First try to locate the file directly
-    if os.path.isfile(os.path.join(PDF_DIR, filename)):
-        return send_from_directory(PDF_DIR, filename)
-    
-    # If not found, try searching in parliament subdirectories
-    for parliament in os.listdir(PDF_DIR):
-        parliament_dir = os.path.join(PDF_DIR, parliament)
-        if os.path.isdir(parliament_dir) and os.path.isfile(os.path.join(parliament_dir, filename)):
-            return send_from_directory(parliament_dir, filename)
-    
-    return jsonify({'error': 'PDF not found'}), 404
+    # O(1) index lookup instead of scanning the parliament subdirectories
+    directory = _lookup_pdf_dir(os.path.basename(filename))
+    if directory is None:
+        return jsonify({'error': 'PDF not found'}), 404
+
+    # conditional=True enables If-Modified-Since/Range handling so repeat
+    # downloads are 304s and large files can be resumed
+    return send_from_directory(directory, os.path.basename(filename), conditional=True)
 
 @app.route('/api/pdf-info/<mp_name>', methods=['GET'])
 def get_pdf_info(mp_name):
     """Get information about PDFs available for a specific MP."""
     conn = get_db_connection()
     
-    # Get MP's disclosures that have PDF URLs
-    disclosures = conn.execute('''
-        SELECT DISTINCT pdf_url, declaration_date
-        FROM disclosures 
-        WHERE mp_name = ? AND pdf_url IS NOT NULL AND pdf_url != ''
+    # Index-only scan over the materialized catalog; no DISTINCT sort needed
+    pdf_info = rows_to_dicts(conn.execute('''
+        SELECT pdf_url, declaration_date
+        FROM pdf_catalog
+        WHERE mp_name = ?
         ORDER BY declaration_date DESC
-    ''', (mp_name,)).fetchall()
-    
-    pdf_info = [dict(row) for row in disclosures]
-    conn.close()
-    
-    return jsonify(pdf_info)
+    ''', (mp_name,)))
+
+    return json_response(pdf_info)
 
 @app.route('/api/nil-entries', methods=['GET'])
 def get_nil_entries():
     """Get counts of nil entries in the database."""
     category = request.args.get('category', None)
-    
-    db_handler = DatabaseHandler(DB_PATH)
-    counts = db_handler.count_nil_entries(category)
-    
+    conn = get_db_connection()
+
+    counts = db_handler.count_nil_entries(category, conn=conn)
+
     # Add breakdown by category if no specific category is requested
     if not category:
-        # Get all categories
-        conn = get_db_connection()
-        categories = conn.execute("SELECT DISTINCT category FROM disclosures").fetchall()
-        conn.close()
-        
-        # Get counts for each category
-        category_counts = {}
-        for cat in categories:
-            cat_name = cat['category']
-            category_counts[cat_name] = db_handler.count_nil_entries(cat_name)
-        
-        counts['categories'] = category_counts
-    
-    return jsonify(counts)
+        # Compute counts for every category in one GROUP BY query
+        counts['categories'] = db_handler.count_nil_entries_by_category(conn=conn)
+
+    return json_response(counts)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 3001))
     debug = os.environ.get('DEBUG', 'True').lower() in ['true', '1', 't']
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    # threaded=True lets the dev server overlap requests; production runs
+    # under gunicorn with gthread workers (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
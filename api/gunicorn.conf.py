@@ -0,0 +1,15 @@
+"""Gunicorn configuration for the disclosures API.
+
+SQLite reads release the GIL while inside the C library, so gthread workers
+overlap request parsing, DB I/O, and response serialization much like an async
+stack would, without porting the app off Flask. Each worker thread holds its
+own long-lived read-only connection (see get_db_connection in app.py).
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 3001)}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WORKER_THREADS', 8))
+keepalive = 30
@@ -2,10 +2,24 @@ import os
 import json
 import sqlite3
 import logging
-import uuid
+import threading
+import queue
 from typing import Dict, Any, List, Optional, Union, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import re
+from collections import defaultdict
+
+# orjson serializes several times faster than the stdlib json used for
+# exports; fall back gracefully if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +28,114 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Module-level so the statement cache keys on the same string object and the
+# VDBE programs stay compiled across batches
+INSERT_DISCLOSURE_SQL = """
+INSERT INTO disclosures
+(id, mp_name, party, electorate, declaration_date, category, item, details, pdf_url, sub_category, entity_id, entity)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_RELATIONSHIP_SQL = """
+INSERT INTO relationships
+(mp_name, entity, relationship_type, value, date_logged)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+INSERT_ENTITY_SQL = """
+INSERT INTO entities
+(id, entity_type, canonical_name, first_appearance_date, last_appearance_date, is_active, confidence_score, mp_id, notes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(mp_id, entity_type, canonical_name) DO UPDATE SET
+    last_appearance_date = CASE
+        WHEN excluded.last_appearance_date != 'Unknown'
+             AND (last_appearance_date IS NULL
+                  OR last_appearance_date IN ('', 'Unknown')
+                  OR excluded.last_appearance_date > last_appearance_date)
+        THEN excluded.last_appearance_date
+        ELSE last_appearance_date
+    END,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+UPDATE_ENTITY_APPEARANCE_SQL = """
+UPDATE entities
+SET last_appearance_date = ?, updated_at = CURRENT_TIMESTAMP
+WHERE id = ?
+"""
+
+# Read-only connections kept around for the query methods; writers stay on
+# the single locked connection
+_READ_POOL_SIZE = 4
+
+# IN-list chunk size, kept under SQLite's default 999 bound-parameter limit
+_IN_CHUNK_SIZE = 900
+
+# Placeholder names that never become entities, shared between the Python
+# guard and the SQL predicates so the two paths can't drift apart
+_SKIP_NAMES = frozenset({'n/a', 'unknown', 'nil', ''})
+_SKIP_NAMES_SQL = ", ".join(f"'{name}'" for name in sorted(_SKIP_NAMES))
+
+# Explicit column tuples zipped straight onto result tuples: SELECT * drags
+# the audit timestamps through every query, and dict(sqlite3.Row) re-hashes
+# column names per row. mp_name leads the disclosure/relationship tuples so
+# groupby can key on position 0.
+DISCLOSURE_COLUMNS = (
+    "mp_name", "party", "electorate", "declaration_date", "category",
+    "item", "details", "pdf_url", "sub_category", "entity_id", "entity", "id")
+ENTITY_COLUMNS = (
+    "id", "entity_type", "canonical_name", "first_appearance_date",
+    "last_appearance_date", "is_active", "confidence_score", "mp_id", "notes")
+RELATIONSHIP_COLUMNS = (
+    "mp_name", "entity", "relationship_type", "value", "date_logged",
+    "relationship_id")
+_DISCLOSURE_SELECT = ", ".join(DISCLOSURE_COLUMNS)
+_ENTITY_SELECT = ", ".join(ENTITY_COLUMNS)
+_RELATIONSHIP_SELECT = ", ".join(RELATIONSHIP_COLUMNS)
+
+# A disclosure names its entity in `entity` or, failing that, `item`;
+# NULL when neither holds a usable name. {t} is the table alias.
+_LINK_NAME_EXPR = (
+    "CASE WHEN {t}.entity IS NOT NULL"
+    " AND lower({t}.entity) NOT IN (" + _SKIP_NAMES_SQL + ") THEN {t}.entity"
+    " WHEN {t}.item IS NOT NULL"
+    " AND lower({t}.item) NOT IN (" + _SKIP_NAMES_SQL + ") THEN {t}.item"
+    " ELSE NULL END"
+)
+
+# Compiled once: name normalization runs per disclosure and again for every
+# entity in compare_mp_entities
+_SUFFIX_RE = re.compile(r'\b(ltd|limited|inc|incorporated|pty|proprietary|p/l|pty ltd)\b')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=65536)
+def _normalize_name(entity_name: str) -> str:
+    """
+    Normalize an entity name for consistent matching.
+
+    Module-level with a bounded LRU: the same raw names recur across
+    disclosures, so repeat calls cost one dict lookup.
+
+    Args:
+        entity_name: The original entity name
+
+    Returns:
+        A normalized version of the entity name
+    """
+    # Convert to lowercase
+    normalized = entity_name.lower()
+
+    # Remove common prefixes/suffixes
+    normalized = _SUFFIX_RE.sub('', normalized)
+
+    # Remove punctuation and extra whitespace
+    normalized = _PUNCT_RE.sub(' ', normalized)
+    normalized = _WS_RE.sub(' ', normalized).strip()
+
+    return normalized
+
 class DatabaseHandler:
     """
     A class to handle database operations for storing structured data.
@@ -27,21 +149,83 @@ class DatabaseHandler:
             db_path: Path to the SQLite database file.
         """
         self.db_path = db_path
+        # One connection for the handler's lifetime: reopening the database
+        # per method call repays the file-open/header-parse cost every time.
+        # isolation_level=None leaves transaction control to the explicit
+        # BEGIN/COMMIT calls below; the lock serializes writers. The larger
+        # statement cache keeps the module-level SQL plus the schema/lookup
+        # statements compiled across calls, so hot-path executes skip the
+        # prepare step entirely.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     isolation_level=None,
+                                     cached_statements=512)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        # Exposes the Python name normalizer to SQL so set-based statements
+        # (the linking pass) match entities the same way the insert path does
+        self._conn.create_function(
+            "normalize_name", 1, _normalize_name, deterministic=True)
+        self._lock = threading.Lock()
         self._initialize_db()
-    
+
+        # WAL allows readers alongside the single writer, so the read-only
+        # methods draw from a small pool of query_only connections instead
+        # of queueing behind writes. A private :memory: database is only
+        # visible to its own connection, so there the reads share _conn.
+        if db_path == ":memory:":
+            self._read_pool = None
+        else:
+            self._read_pool = queue.Queue(maxsize=_READ_POOL_SIZE)
+            for _ in range(_READ_POOL_SIZE):
+                reader = sqlite3.connect(db_path, check_same_thread=False,
+                                         cached_statements=512)
+                reader.execute("PRAGMA query_only=1")
+                reader.execute("PRAGMA busy_timeout=5000")
+                self._read_pool.put(reader)
+
+    @contextmanager
+    def _reader(self):
+        """
+        Borrow a read-only connection from the pool for the duration of a
+        with-block.
+        """
+        if self._read_pool is None:
+            yield self._conn
+            return
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def close(self):
+        """
+        Close the handler's database connections.
+        """
+        if self._read_pool is not None:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+        self._conn.close()
+
     def _initialize_db(self):
         """
         Initialize the database schema if it doesn't exist.
         """
         logger.info(f"Initializing database at {self.db_path}")
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._conn
         cursor = conn.cursor()
         
-        # Create disclosures table
+        # Create disclosures table. INTEGER PRIMARY KEY is the rowid itself:
+        # 36-byte uuid text keys inflated every B-tree page and were stored
+        # again by each FK reference
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS disclosures (
-            id TEXT PRIMARY KEY,
+            id INTEGER PRIMARY KEY,
             mp_name TEXT NOT NULL,
             party TEXT,
             electorate TEXT,
@@ -51,18 +235,18 @@ class DatabaseHandler:
             details TEXT,
             pdf_url TEXT,
             sub_category TEXT,
-            entity_id TEXT,
+            entity_id INTEGER,
             entity TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (entity_id) REFERENCES entities(id)
         )
         ''')
-        
+
         # Create entities table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS entities (
-            id TEXT PRIMARY KEY,
+            id INTEGER PRIMARY KEY,
             entity_type TEXT NOT NULL,
             canonical_name TEXT NOT NULL,
             first_appearance_date TEXT,
@@ -75,11 +259,11 @@ class DatabaseHandler:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
-        
+
         # Create relationships table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS relationships (
-            relationship_id TEXT PRIMARY KEY,
+            relationship_id INTEGER PRIMARY KEY,
             mp_name TEXT NOT NULL,
             entity TEXT NOT NULL,
             relationship_type TEXT NOT NULL,
@@ -89,24 +273,227 @@ class DatabaseHandler:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
-        
+
+        # Rebuild databases created with TEXT uuid primary keys
+        cursor.execute(
+            "SELECT type FROM pragma_table_info('disclosures') WHERE name = 'id'")
+        if cursor.fetchone()[0] == "TEXT":
+            self._migrate_to_integer_ids(cursor)
+
         # Check if entity_id column exists in disclosures, add it if not
         cursor.execute("PRAGMA table_info(disclosures)")
         columns = [column[1] for column in cursor.fetchall()]
-        
+
         if "entity_id" not in columns:
             logger.info("Adding entity_id column to disclosures table")
-            cursor.execute("ALTER TABLE disclosures ADD COLUMN entity_id TEXT REFERENCES entities(id)")
+            cursor.execute("ALTER TABLE disclosures ADD COLUMN entity_id INTEGER REFERENCES entities(id)")
         
         # Check if sub_category column exists, add it if not
         if "sub_category" not in columns:
             logger.info("Adding sub_category column to disclosures table")
             cursor.execute("ALTER TABLE disclosures ADD COLUMN sub_category TEXT")
-        
+
+        # Indexes for the per-disclosure entity lookups and the MP-scoped
+        # queries; without them each lookup is a full table scan
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entities_mp_name "
+            "ON entities(mp_id, canonical_name)")
+        # Unique: one entity per (mp, type, name), enforced at the index so
+        # the entity insert can upsert instead of SELECT-then-INSERT; also
+        # serves the lookups the old non-unique mp/type/name index did
+        cursor.execute("DROP INDEX IF EXISTS idx_entities_mp_type_name")
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_entities_unique "
+            "ON entities(mp_id, entity_type, canonical_name)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disclosures_mp ON disclosures(mp_name)")
+        # (entity_id, declaration_date) serves get_entity_timeline's ORDER BY
+        # straight from the index; (mp_name, entity_id) covers the export path
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disclosures_entity_date "
+            "ON disclosures(entity_id, declaration_date)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disclosures_mp_entity "
+            "ON disclosures(mp_name, entity_id)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_relationships_mp ON relationships(mp_name)")
+
+        # FTS5 index over canonical names: the old LIKE '%…%' search could
+        # never use an index, so every name lookup scanned the table. The
+        # external-content table stays in sync through the triggers and is
+        # rebuilt once when an existing database first gains it
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entities_fts'")
+        fts_missing = cursor.fetchone() is None
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5("
+            "canonical_name, content='entities', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')")
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN
+            INSERT INTO entities_fts(rowid, canonical_name)
+            VALUES (new.id, new.canonical_name);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN
+            INSERT INTO entities_fts(entities_fts, rowid, canonical_name)
+            VALUES ('delete', old.id, old.canonical_name);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE OF canonical_name ON entities BEGIN
+            INSERT INTO entities_fts(entities_fts, rowid, canonical_name)
+            VALUES ('delete', old.id, old.canonical_name);
+            INSERT INTO entities_fts(rowid, canonical_name)
+            VALUES (new.id, new.canonical_name);
+        END
+        ''')
+        if fts_missing:
+            cursor.execute(
+                "INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')")
+
+        # Populate sqlite_stat1 so the planner picks the indexes
+        cursor.execute("ANALYZE")
+
         conn.commit()
-        conn.close()
-    
-    def store_structured_data(self, structured_data: Dict[str, Any]) -> List[str]:
+
+    def _migrate_to_integer_ids(self, cursor) -> None:
+        """
+        Rebuild the tables of a uuid-keyed database with integer keys.
+
+        Entity ids are reassigned in rowid order through a temp mapping
+        table so disclosure links survive the copy. Runs in autocommit
+        (foreign_keys can't toggle inside a transaction, and the copy
+        briefly mixes old text ids with new integer FKs).
+        """
+        logger.info("Migrating uuid text primary keys to integer ids")
+
+        cursor.execute("PRAGMA foreign_keys=OFF")
+
+        cursor.execute("SELECT name FROM pragma_table_info('disclosures')")
+        old_columns = {row[0] for row in cursor.fetchall()}
+
+        cursor.execute(
+            """
+            CREATE TEMP TABLE _entity_id_map AS
+            SELECT id AS old_id, ROW_NUMBER() OVER (ORDER BY rowid) AS new_id
+            FROM entities
+            """
+        )
+        cursor.execute(
+            "CREATE INDEX temp.idx_entity_id_map ON _entity_id_map(old_id)")
+
+        cursor.execute('''
+        CREATE TABLE entities_new (
+            id INTEGER PRIMARY KEY,
+            entity_type TEXT NOT NULL,
+            canonical_name TEXT NOT NULL,
+            first_appearance_date TEXT,
+            last_appearance_date TEXT,
+            is_active BOOLEAN DEFAULT TRUE,
+            confidence_score FLOAT,
+            mp_id TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        cursor.execute(
+            """
+            INSERT INTO entities_new
+            SELECT m.new_id, e.entity_type, e.canonical_name,
+                   e.first_appearance_date, e.last_appearance_date,
+                   e.is_active, e.confidence_score, e.mp_id, e.notes,
+                   e.created_at, e.updated_at
+            FROM entities e
+            JOIN _entity_id_map m ON m.old_id = e.id
+            """
+        )
+
+        cursor.execute('''
+        CREATE TABLE disclosures_new (
+            id INTEGER PRIMARY KEY,
+            mp_name TEXT NOT NULL,
+            party TEXT,
+            electorate TEXT,
+            declaration_date TEXT,
+            category TEXT,
+            item TEXT,
+            details TEXT,
+            pdf_url TEXT,
+            sub_category TEXT,
+            entity_id INTEGER,
+            entity TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (entity_id) REFERENCES entities(id)
+        )
+        ''')
+        # Guard the columns the ALTER probes below would normally add:
+        # pre-probe databases can reach this rebuild without them
+        sub_category_expr = (
+            "d.sub_category" if "sub_category" in old_columns else "NULL")
+        entity_id_expr = "m.new_id" if "entity_id" in old_columns else "NULL"
+        join_clause = (
+            "LEFT JOIN _entity_id_map m ON m.old_id = d.entity_id"
+            if "entity_id" in old_columns else "")
+        cursor.execute(f"""
+            INSERT INTO disclosures_new
+            (mp_name, party, electorate, declaration_date, category, item,
+             details, pdf_url, sub_category, entity_id, entity,
+             created_at, updated_at)
+            SELECT d.mp_name, d.party, d.electorate, d.declaration_date,
+                   d.category, d.item, d.details, d.pdf_url,
+                   {sub_category_expr}, {entity_id_expr}, d.entity,
+                   d.created_at, d.updated_at
+            FROM disclosures d
+            {join_clause}
+            """
+        )
+
+        cursor.execute(
+            "SELECT type FROM pragma_table_info('relationships') "
+            "WHERE name = 'relationship_id'")
+        row = cursor.fetchone()
+        if row and row[0] == "TEXT":
+            cursor.execute('''
+            CREATE TABLE relationships_new (
+                relationship_id INTEGER PRIMARY KEY,
+                mp_name TEXT NOT NULL,
+                entity TEXT NOT NULL,
+                relationship_type TEXT NOT NULL,
+                value TEXT,
+                date_logged TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            cursor.execute(
+                """
+                INSERT INTO relationships_new
+                (mp_name, entity, relationship_type, value, date_logged,
+                 created_at, updated_at)
+                SELECT mp_name, entity, relationship_type, value,
+                       date_logged, created_at, updated_at
+                FROM relationships
+                """
+            )
+            cursor.execute("DROP TABLE relationships")
+            cursor.execute(
+                "ALTER TABLE relationships_new RENAME TO relationships")
+
+        cursor.execute("DROP TABLE disclosures")
+        cursor.execute("DROP TABLE entities")
+        cursor.execute("ALTER TABLE entities_new RENAME TO entities")
+        cursor.execute("ALTER TABLE disclosures_new RENAME TO disclosures")
+        cursor.execute("DROP TABLE _entity_id_map")
+
+        cursor.execute("PRAGMA foreign_keys=ON")
+
+        logger.info("Finished integer-id migration")
+
+    def store_structured_data(self, structured_data: Dict[str, Any]) -> List[int]:
         """
         Store structured data in the database.
         
@@ -117,204 +504,224 @@ class DatabaseHandler:
             A list of IDs for the inserted disclosure records.
         """
         logger.info(f"Storing structured data for MP: {structured_data.get('mp_name', 'Unknown')}")
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._conn
         cursor = conn.cursor()
-        
-        try:
-            # Begin transaction
-            conn.execute("BEGIN TRANSACTION")
-            
-            # Get MP information
-            mp_name = structured_data.get("mp_name", "Unknown")
-            party = structured_data.get("party", "Unknown")
-            electorate = structured_data.get("electorate", "Unknown")
-            
-            # Store disclosures
-            disclosure_ids = []
-            disclosures = structured_data.get("disclosures", [])
-            
-            for disclosure in disclosures:
-                disclosure_id = str(uuid.uuid4())
-                declaration_date = disclosure.get("declaration_date", "Unknown")
-                category = disclosure.get("category", "Unknown")
-                item = disclosure.get("entity", "Unknown")
-                entity = item
-                details = disclosure.get("details", "")
-                pdf_url = disclosure.get("pdf_url", "")
-                sub_category = disclosure.get("sub_category", "")
-                
-                # Find or create entity
-                entity_id = self._find_or_create_entity(
-                    cursor, 
-                    mp_name, 
-                    category, 
-                    entity,
-                    declaration_date
-                )
-                
-                cursor.execute(
-                    """
-                    INSERT INTO disclosures 
-                    (id, mp_name, party, electorate, declaration_date, category, item, details, pdf_url, sub_category, entity_id, entity) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (disclosure_id, mp_name, party, electorate, declaration_date, category, item, details, pdf_url, sub_category, entity_id, entity)
-                )
-                
-                disclosure_ids.append(disclosure_id)
-            
-            # Store relationships
-            relationships = structured_data.get("relationships", [])
-            
-            for relationship in relationships:
-                relationship_id = str(uuid.uuid4())
-                entity = relationship.get("entity", "Unknown")
-                relationship_type = relationship.get("relationship_type", "Unknown")
-                value = relationship.get("value", "Undisclosed")
-                date_logged = relationship.get("date_logged", "Unknown")
-                
-                cursor.execute(
-                    """
-                    INSERT INTO relationships 
-                    (relationship_id, mp_name, entity, relationship_type, value, date_logged) 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (relationship_id, mp_name, entity, relationship_type, value, date_logged)
-                )
-            
-            # Commit transaction
-            conn.commit()
-            
-            logger.info(f"Successfully stored structured data for MP: {mp_name}")
-            return disclosure_ids
-            
-        except Exception as e:
-            # Rollback transaction on error
-            conn.rollback()
-            logger.error(f"Error storing structured data: {str(e)}")
-            raise
-            
-        finally:
-            conn.close()
-    
-    def _find_or_create_entity(self, cursor, mp_name: str, category: str, entity_name: str, declaration_date: str) -> str:
+
+        with self._lock:
+            try:
+                # Begin transaction
+                conn.execute("BEGIN IMMEDIATE")
+                disclosure_ids = self._store_one(cursor, structured_data)
+
+                # Commit transaction
+                conn.commit()
+
+                logger.info(f"Successfully stored structured data for MP: {structured_data.get('mp_name', 'Unknown')}")
+                return disclosure_ids
+
+            except Exception as e:
+                # Rollback transaction on error
+                conn.rollback()
+                logger.error(f"Error storing structured data: {str(e)}")
+                raise
+
+    def _store_one(self, cursor, structured_data: Dict[str, Any]) -> List[int]:
         """
-        Find an existing entity or create a new one.
-        
+        Insert one structured data record using the caller's cursor.
+
+        Transaction control (and the write lock) belong to the caller so
+        batch flows can merge many records into one commit.
+        """
+        # Get MP information
+        mp_name = structured_data.get("mp_name", "Unknown")
+        party = structured_data.get("party", "Unknown")
+        electorate = structured_data.get("electorate", "Unknown")
+
+        # Resolve entities against one pre-fetched cache, then insert all
+        # disclosures in one executemany instead of a VDBE round-trip per row
+        entity_cache = self._load_mp_entity_cache(cursor, mp_name)
+
+        # Sequential integer ids; safe to pre-assign because the handler
+        # lock plus BEGIN IMMEDIATE make this the only writer
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM disclosures")
+        next_id = cursor.fetchone()[0]
+
+        disclosure_ids = []
+        disclosure_rows = []
+        disclosures = structured_data.get("disclosures", [])
+
+        for disclosure in disclosures:
+            next_id += 1
+            disclosure_id = next_id
+            declaration_date = disclosure.get("declaration_date", "Unknown")
+            category = disclosure.get("category", "Unknown")
+            item = disclosure.get("entity", "Unknown")
+            entity = item
+            details = disclosure.get("details", "")
+            pdf_url = disclosure.get("pdf_url", "")
+            sub_category = disclosure.get("sub_category", "")
+
+            # Find or create entity
+            entity_id = self._find_or_create_entity(
+                entity_cache,
+                mp_name,
+                category,
+                entity,
+                declaration_date
+            )
+
+            disclosure_rows.append(
+                (disclosure_id, mp_name, party, electorate, declaration_date, category, item, details, pdf_url, sub_category, entity_id, entity)
+            )
+            disclosure_ids.append(disclosure_id)
+
+        # New entities must land before the disclosures that reference them
+        self._flush_entity_cache(cursor, entity_cache)
+
+        if disclosure_rows:
+            cursor.executemany(INSERT_DISCLOSURE_SQL, disclosure_rows)
+
+        # Store relationships the same way; relationship_id is assigned by
+        # the rowid machinery
+        relationship_rows = [
+            (
+                mp_name,
+                relationship.get("entity", "Unknown"),
+                relationship.get("relationship_type", "Unknown"),
+                relationship.get("value", "Undisclosed"),
+                relationship.get("date_logged", "Unknown"),
+            )
+            for relationship in structured_data.get("relationships", [])
+        ]
+
+        if relationship_rows:
+            cursor.executemany(INSERT_RELATIONSHIP_SQL, relationship_rows)
+
+        return disclosure_ids
+
+    def _load_mp_entity_cache(self, cursor, mp_name: str) -> Dict[str, Any]:
+        """
+        Load all of an MP's entities into lookup dicts in one query.
+
+        Replaces the per-disclosure SELECTs in entity resolution: K
+        disclosures resolve against the dicts instead of issuing up to 2K
+        point lookups.
+
         Args:
             cursor: Database cursor
             mp_name: Name of the MP
+
+        Returns:
+            A cache dict with name and (name, type) lookups plus buffers of
+            pending entity inserts and last_appearance_date updates
+        """
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM entities")
+        id_counter = [cursor.fetchone()[0]]
+
+        cursor.execute(
+            """
+            SELECT id, canonical_name, entity_type, last_appearance_date
+            FROM entities
+            WHERE mp_id = ?
+            """,
+            (mp_name,)
+        )
+
+        by_name = {}
+        by_name_type = {}
+        for entity_id, canonical_name, entity_type, last_date in cursor.fetchall():
+            # Mutable [id, last_date] rows are shared between both lookup
+            # dicts so a date bump is visible through either key
+            row = [entity_id, last_date]
+            by_name.setdefault(canonical_name, row)
+            by_name_type.setdefault((canonical_name, entity_type), row)
+
+        return {
+            "by_name": by_name,
+            "by_name_type": by_name_type,
+            "next_id": id_counter,
+            "inserts": [],
+            "updates": {},
+        }
+
+    def _find_or_create_entity(self, cache: Dict[str, Any], mp_name: str, category: str, entity_name: str, declaration_date: str) -> Optional[int]:
+        """
+        Find an existing entity in the cache or buffer a new one.
+
+        Args:
+            cache: Entity cache from _load_mp_entity_cache
+            mp_name: Name of the MP
             category: Category of the disclosure
             entity_name: Name of the entity
             declaration_date: Date of the declaration
-            
+
         Returns:
             The ID of the found or created entity
         """
         # Skip if entity is N/A or Unknown
-        if entity_name.lower() in ['n/a', 'unknown', 'nil', '']:
+        if not entity_name or entity_name.lower() in _SKIP_NAMES:
             return None
-        
+
         # Normalize entity name
         normalized_name = self._normalize_entity_name(entity_name)
-        
-        # First, try to find an existing entity for this MP with same entity name regardless of category
-        # This helps track the same company/organization across different declarations
-        cursor.execute(
-            """
-            SELECT e.id, e.canonical_name, e.first_appearance_date, e.last_appearance_date, e.entity_type
-            FROM entities e
-            WHERE e.mp_id = ? AND e.canonical_name = ?
-            """,
-            (mp_name, normalized_name)
-        )
-        
-        entity = cursor.fetchone()
-        
-        if entity:
-            # Entity exists for this MP, update last_appearance_date if needed
-            entity_id = entity[0]
-            last_appearance_date = entity[3]
-            
-            if declaration_date != "Unknown" and (last_appearance_date == "Unknown" or declaration_date > last_appearance_date):
-                cursor.execute(
-                    """
-                    UPDATE entities
-                    SET last_appearance_date = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (declaration_date, entity_id)
-                )
-            
+
+        # First, try to find an existing entity for this MP with same entity
+        # name regardless of category, then fall back to name + category
+        row = cache["by_name"].get(normalized_name)
+        if row is None:
+            row = cache["by_name_type"].get((normalized_name, category))
+
+        if row is not None:
+            entity_id, last_appearance_date = row
+
+            if declaration_date != "Unknown" and (not last_appearance_date or last_appearance_date == "Unknown" or declaration_date > last_appearance_date):
+                row[1] = declaration_date
+                cache["updates"][entity_id] = declaration_date
+
             return entity_id
-        else:
-            # If not found by name alone, try with category as well (traditional approach)
-            cursor.execute(
-                """
-                SELECT e.id, e.canonical_name, e.first_appearance_date, e.last_appearance_date
-                FROM entities e
-                WHERE e.mp_id = ? AND e.entity_type = ? AND e.canonical_name = ?
-                """,
-                (mp_name, category, normalized_name)
+
+        # Create new entity
+        cache["next_id"][0] += 1
+        entity_id = cache["next_id"][0]
+        cache["inserts"].append(
+            (entity_id, category, normalized_name, declaration_date, declaration_date, True, 1.0, mp_name, "")
+        )
+
+        row = [entity_id, declaration_date]
+        cache["by_name"][normalized_name] = row
+        cache["by_name_type"][(normalized_name, category)] = row
+
+        return entity_id
+
+    def _flush_entity_cache(self, cursor, cache: Dict[str, Any]) -> None:
+        """
+        Write the cache's buffered entity inserts and updates in bulk.
+        """
+        if cache["inserts"]:
+            cursor.executemany(INSERT_ENTITY_SQL, cache["inserts"])
+            cache["inserts"] = []
+
+        if cache["updates"]:
+            cursor.executemany(
+                UPDATE_ENTITY_APPEARANCE_SQL,
+                [(date, entity_id) for entity_id, date in cache["updates"].items()]
             )
-            
-            entity = cursor.fetchone()
-            
-            if entity:
-                # Entity exists for this MP and category, update last_appearance_date if needed
-                entity_id = entity[0]
-                last_appearance_date = entity[3]
-                
-                if declaration_date != "Unknown" and (last_appearance_date == "Unknown" or declaration_date > last_appearance_date):
-                    cursor.execute(
-                        """
-                        UPDATE entities
-                        SET last_appearance_date = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                        """,
-                        (declaration_date, entity_id)
-                    )
-                
-                return entity_id
-            else:
-                # Create new entity
-                entity_id = str(uuid.uuid4())
-                
-                cursor.execute(
-                    """
-                    INSERT INTO entities
-                    (id, entity_type, canonical_name, first_appearance_date, last_appearance_date, is_active, confidence_score, mp_id, notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (entity_id, category, normalized_name, declaration_date, declaration_date, True, 1.0, mp_name, "")
-                )
-                
-                return entity_id
+            cache["updates"] = {}
     
     def _normalize_entity_name(self, entity_name: str) -> str:
         """
         Normalize an entity name for consistent matching.
-        
+
         Args:
             entity_name: The original entity name
-            
+
         Returns:
             A normalized version of the entity name
         """
-        # Convert to lowercase
-        normalized = entity_name.lower()
-        
-        # Remove common prefixes/suffixes
-        normalized = re.sub(r'\b(ltd|limited|inc|incorporated|pty|proprietary|p/l|pty ltd)\b', '', normalized)
-        
-        # Remove punctuation and extra whitespace
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return _normalize_name(entity_name)
     
-    def batch_store_structured_data(self, structured_data_list: List[Dict[str, Any]]) -> List[List[str]]:
+    def batch_store_structured_data(self, structured_data_list: List[Dict[str, Any]]) -> List[List[int]]:
         """
         Store multiple structured data records in the database.
         
@@ -325,17 +732,30 @@ class DatabaseHandler:
             A list of lists of disclosure IDs for the inserted records.
         """
         logger.info(f"Batch storing {len(structured_data_list)} structured data records")
-        
+
+        conn = self._conn
+        cursor = conn.cursor()
+
         disclosure_ids_list = []
-        
-        for structured_data in structured_data_list:
-            try:
-                disclosure_ids = self.store_structured_data(structured_data)
-                disclosure_ids_list.append(disclosure_ids)
-            except Exception as e:
-                logger.error(f"Error storing structured data: {str(e)}")
-                disclosure_ids_list.append([])
-        
+
+        # One outer transaction for the whole batch collapses N commits (and
+        # their fsyncs) into one; a savepoint per record keeps a bad record
+        # from discarding the rest
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            for structured_data in structured_data_list:
+                cursor.execute("SAVEPOINT record")
+                try:
+                    disclosure_ids = self._store_one(cursor, structured_data)
+                    cursor.execute("RELEASE SAVEPOINT record")
+                    disclosure_ids_list.append(disclosure_ids)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT record")
+                    cursor.execute("RELEASE SAVEPOINT record")
+                    logger.error(f"Error storing structured data: {str(e)}")
+                    disclosure_ids_list.append([])
+            conn.commit()
+
         return disclosure_ids_list
     
     def export_to_json(self, output_path: str) -> None:
@@ -346,55 +766,56 @@ class DatabaseHandler:
             output_path: Path to the output JSON file.
         """
         logger.info(f"Exporting database to JSON: {output_path}")
-        
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
+
         try:
-            # Get all unique MPs
-            cursor.execute("SELECT DISTINCT mp_name, party, electorate FROM disclosures")
-            mps = [dict(row) for row in cursor.fetchall()]
-            
-            result = []
-            
-            # For each MP, get their disclosures and relationships
-            for mp in mps:
-                mp_name = mp["mp_name"]
-                
-                # Get disclosures
-                cursor.execute("SELECT * FROM disclosures WHERE mp_name = ?", (mp_name,))
-                disclosures = [dict(row) for row in cursor.fetchall()]
-                
-                # Get relationships
-                cursor.execute("SELECT * FROM relationships WHERE mp_name = ?", (mp_name,))
-                relationships = [dict(row) for row in cursor.fetchall()]
-                
-                # Create MP record
-                mp_record = {
-                    "mp_name": mp_name,
-                    "party": mp["party"],
-                    "electorate": mp["electorate"],
-                    "disclosures": disclosures,
-                    "relationships": relationships
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                # Relationships are the small side: fold them into a lookup first
+                cursor.execute(
+                    f"SELECT {_RELATIONSHIP_SELECT} FROM relationships ORDER BY mp_name")
+                relationships_by_mp = {
+                    mp_name: [dict(zip(RELATIONSHIP_COLUMNS, row)) for row in rows]
+                    for mp_name, rows in groupby(cursor, key=itemgetter(0))
                 }
-                
-                result.append(mp_record)
-            
-            # Write to JSON file
-            with open(output_path, "w") as f:
-                json.dump(result, f, indent=2)
-            
-            logger.info(f"Successfully exported database to JSON: {output_path}")
-            
+
+                # One ordered scan of disclosures replaces the per-MP SELECT
+                # pair; groupby folds consecutive rows into each MP's record and
+                # records are written as they are built, so the full export
+                # never sits in memory
+                cursor.execute(
+                    f"SELECT {_DISCLOSURE_SELECT} FROM disclosures ORDER BY mp_name")
+
+                with open(output_path, "wb") as f:
+                    f.write(b"[\n")
+                    first = True
+                    for mp_name, rows in groupby(cursor, key=itemgetter(0)):
+                        disclosures = [dict(zip(DISCLOSURE_COLUMNS, row)) for row in rows]
+
+                        mp_record = {
+                            "mp_name": mp_name,
+                            "party": disclosures[0]["party"],
+                            "electorate": disclosures[0]["electorate"],
+                            "disclosures": disclosures,
+                            "relationships": relationships_by_mp.get(mp_name, [])
+                        }
+
+                        if not first:
+                            f.write(b",\n")
+                        if orjson is not None:
+                            f.write(orjson.dumps(mp_record, option=orjson.OPT_INDENT_2))
+                        else:
+                            f.write(json.dumps(mp_record, indent=2).encode())
+                        first = False
+                    f.write(b"\n]")
+
+                logger.info(f"Successfully exported database to JSON: {output_path}")
+
         except Exception as e:
             logger.error(f"Error exporting database to JSON: {str(e)}")
             raise
-            
-        finally:
-            conn.close()
     
-    def get_entity_timeline(self, entity_id: str) -> Dict[str, Any]:
+    def get_entity_timeline(self, entity_id: int) -> Dict[str, Any]:
         """
         Get the timeline of a specific entity.
         
@@ -404,45 +825,99 @@ class DatabaseHandler:
         Returns:
             A dictionary containing entity information and its timeline of disclosures
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         try:
-            # Get entity information
-            cursor.execute("SELECT * FROM entities WHERE id = ?", (entity_id,))
-            entity_row = cursor.fetchone()
-            
-            if not entity_row:
-                logger.warning(f"Entity not found with ID: {entity_id}")
-                return {"entity": {}, "timeline": []}
-                
-            entity = dict(entity_row)
-            
-            # Get all disclosures for this entity
-            cursor.execute(
-                """
-                SELECT * FROM disclosures 
-                WHERE entity_id = ? 
-                ORDER BY declaration_date
-                """, 
-                (entity_id,)
-            )
-            
-            disclosures = [dict(row) for row in cursor.fetchall()]
-            
-            return {
-                "entity": entity,
-                "timeline": disclosures
-            }
-            
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                # Get entity information
+                cursor.execute(
+                    f"SELECT {_ENTITY_SELECT} FROM entities WHERE id = ?",
+                    (entity_id,))
+                entity_row = cursor.fetchone()
+
+                if not entity_row:
+                    logger.warning(f"Entity not found with ID: {entity_id}")
+                    return {"entity": {}, "timeline": []}
+
+                entity = dict(zip(ENTITY_COLUMNS, entity_row))
+
+                # Get all disclosures for this entity
+                cursor.execute(
+                    f"""
+                    SELECT {_DISCLOSURE_SELECT} FROM disclosures
+                    WHERE entity_id = ?
+                    ORDER BY declaration_date
+                    """,
+                    (entity_id,)
+                )
+
+                disclosures = [
+                    dict(zip(DISCLOSURE_COLUMNS, row)) for row in cursor.fetchall()]
+
+                return {
+                    "entity": entity,
+                    "timeline": disclosures
+                }
+
         except Exception as e:
             logger.error(f"Error getting entity timeline: {str(e)}")
             return {"entity": {}, "timeline": []}
-            
-        finally:
-            conn.close()
-    
+
+    def get_entity_timelines_bulk(self, entity_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the timelines of many entities with one query pair per chunk.
+
+        Replaces N get_entity_timeline round-trips (2N queries) with two
+        IN-list queries per chunk of ids, chunked to stay under SQLite's
+        bound-parameter limit.
+
+        Args:
+            entity_ids: IDs of the entities to fetch
+
+        Returns:
+            A dict mapping each found entity id to its
+            {"entity": ..., "timeline": [...]} record
+        """
+        timelines: Dict[int, Dict[str, Any]] = {}
+
+        if not entity_ids:
+            return timelines
+
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                for start in range(0, len(entity_ids), _IN_CHUNK_SIZE):
+                    chunk = entity_ids[start:start + _IN_CHUNK_SIZE]
+                    placeholders = ", ".join("?" * len(chunk))
+
+                    cursor.execute(
+                        f"SELECT {_ENTITY_SELECT} FROM entities "
+                        f"WHERE id IN ({placeholders})",
+                        chunk)
+                    for row in cursor.fetchall():
+                        timelines[row[0]] = {
+                            "entity": dict(zip(ENTITY_COLUMNS, row)),
+                            "timeline": []
+                        }
+
+                    cursor.execute(
+                        f"SELECT {_DISCLOSURE_SELECT} FROM disclosures "
+                        f"WHERE entity_id IN ({placeholders}) "
+                        "ORDER BY entity_id, declaration_date",
+                        chunk)
+                    for row in cursor:
+                        disclosure = dict(zip(DISCLOSURE_COLUMNS, row))
+                        record = timelines.get(disclosure["entity_id"])
+                        if record is not None:
+                            record["timeline"].append(disclosure)
+
+            return timelines
+
+        except Exception as e:
+            logger.error(f"Error getting bulk entity timelines: {str(e)}")
+            return timelines
+
     def get_mp_entities(self, mp_name: str) -> List[Dict[str, Any]]:
         """
         Get all entities for a specific MP.
@@ -453,33 +928,71 @@ class DatabaseHandler:
         Returns:
             A list of entities owned by the MP
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         try:
-            # Get all entities for this MP
-            cursor.execute(
-                """
-                SELECT * FROM entities 
-                WHERE mp_id = ? 
-                ORDER BY entity_type, canonical_name
-                """, 
-                (mp_name,)
-            )
-            
-            entities = [dict(row) for row in cursor.fetchall()]
-            
-            return entities
-            
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                # Get all entities for this MP
+                cursor.execute(
+                    f"""
+                    SELECT {_ENTITY_SELECT} FROM entities
+                    WHERE mp_id = ?
+                    ORDER BY entity_type, canonical_name
+                    """,
+                    (mp_name,)
+                )
+
+                entities = [
+                    dict(zip(ENTITY_COLUMNS, row)) for row in cursor.fetchall()]
+
+                return entities
+
         except Exception as e:
             logger.error(f"Error getting MP entities: {str(e)}")
             return []
-            
-        finally:
-            conn.close()
-    
-    def get_entity_changes(self, entity_id: str) -> Dict[str, Any]:
+
+    def get_mp_entity_monthly_counts(self, mp_name: str) -> List[Tuple[str, str, int]]:
+        """
+        Count an MP's linked disclosures per month and entity type.
+
+        One grouped SELECT replaces fetching every entity timeline just to
+        bucket its dates; rows with unparseable declaration dates (e.g. the
+        'Unknown' sentinel) are dropped.
+
+        Args:
+            mp_name: The name of the MP
+
+        Returns:
+            A list of (month, entity_type, count) tuples where month is the
+            first day of the month as 'YYYY-MM-01', ordered by month then
+            entity type
+        """
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(
+                    """
+                    SELECT strftime('%Y-%m-01', d.declaration_date) AS month,
+                           e.entity_type,
+                           COUNT(*)
+                    FROM disclosures d
+                    JOIN entities e ON d.entity_id = e.id
+                    WHERE d.mp_name = ?
+                      AND strftime('%Y-%m-01', d.declaration_date) IS NOT NULL
+                    GROUP BY month, e.entity_type
+                    ORDER BY month, e.entity_type
+                    """,
+                    (mp_name,)
+                )
+
+                return cursor.fetchall()
+
+        except Exception as e:
+            logger.error(f"Error getting MP entity monthly counts: {str(e)}")
+            return []
+
+    def get_entity_changes(self, entity_id: int) -> Dict[str, Any]:
         """
         Analyze changes in an entity's timeline.
         
@@ -489,60 +1002,92 @@ class DatabaseHandler:
         Returns:
             A dictionary containing analysis of changes over time
         """
-        entity_timeline = self.get_entity_timeline(entity_id)
-        entity = entity_timeline["entity"]
-        timeline = entity_timeline["timeline"]
-        
-        if not entity or not timeline:
+        with self._reader() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                f"SELECT {_ENTITY_SELECT} FROM entities WHERE id = ?",
+                (entity_id,))
+            entity_row = cursor.fetchone()
+
+            if not entity_row:
+                return {
+                    "entity_id": entity_id,
+                    "error": "Entity or timeline not found"
+                }
+
+            entity = dict(zip(ENTITY_COLUMNS, entity_row))
+
+            # LAG pairs each row with its predecessor inside the engine, so
+            # only the compared columns cross into Python and nothing is
+            # re-sorted or materialized as per-row dicts
+            cursor.execute(
+                """
+                SELECT declaration_date,
+                       details, LAG(details) OVER w,
+                       category, LAG(category) OVER w,
+                       sub_category, LAG(sub_category) OVER w
+                FROM disclosures
+                WHERE entity_id = ?
+                WINDOW w AS (ORDER BY declaration_date)
+                """,
+                (entity_id,)
+            )
+
+            changes = []
+            first_appearance = None
+            last_appearance = None
+            num_appearances = 0
+            for (declaration_date, details, prev_details, category,
+                 prev_category, sub_category, prev_sub_category) in cursor:
+                num_appearances += 1
+                last_appearance = declaration_date
+                if first_appearance is None:
+                    first_appearance = declaration_date
+                    continue
+
+                # Check for changes in details
+                if prev_details != details:
+                    changes.append({
+                        "type": "details_change",
+                        "date": declaration_date,
+                        "from": prev_details,
+                        "to": details
+                    })
+
+                # Check for changes in category
+                if prev_category != category:
+                    changes.append({
+                        "type": "category_change",
+                        "date": declaration_date,
+                        "from": prev_category,
+                        "to": category
+                    })
+
+                # Check for changes in sub_category
+                if prev_sub_category != sub_category:
+                    changes.append({
+                        "type": "sub_category_change",
+                        "date": declaration_date,
+                        "from": prev_sub_category,
+                        "to": sub_category
+                    })
+
+            if num_appearances == 0:
+                return {
+                    "entity_id": entity_id,
+                    "error": "Entity or timeline not found"
+                }
+
             return {
-                "entity_id": entity_id,
-                "error": "Entity or timeline not found"
+                "entity": entity,
+                "first_appearance": first_appearance,
+                "last_appearance": last_appearance,
+                "num_appearances": num_appearances,
+                "changes": changes
             }
-        
-        # Sort timeline by declaration date
-        timeline = sorted(timeline, key=lambda x: x["declaration_date"])
-        
-        # Analyze changes
-        changes = []
-        for i in range(1, len(timeline)):
-            prev = timeline[i-1]
-            curr = timeline[i]
-            
-            # Check for changes in details
-            if prev["details"] != curr["details"]:
-                changes.append({
-                    "type": "details_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["details"],
-                    "to": curr["details"]
-                })
-            
-            # Check for changes in category
-            if prev["category"] != curr["category"]:
-                changes.append({
-                    "type": "category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["category"],
-                    "to": curr["category"]
-                })
-            
-            # Check for changes in sub_category
-            if prev.get("sub_category") != curr.get("sub_category"):
-                changes.append({
-                    "type": "sub_category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev.get("sub_category"),
-                    "to": curr.get("sub_category")
-                })
-        
-        return {
-            "entity": entity,
-            "first_appearance": timeline[0]["declaration_date"] if timeline else None,
-            "last_appearance": timeline[-1]["declaration_date"] if timeline else None,
-            "num_appearances": len(timeline),
-            "changes": changes
-        }
-    
+
+
     def get_mp_entity_summary(self, mp_name: str) -> Dict[str, Any]:
         """
         Get a summary of all entities for a specific MP.
@@ -564,13 +1109,10 @@ class DatabaseHandler:
             }
         
         # Group entities by type
-        entities_by_type = {}
+        entities_by_type = defaultdict(list)
         for entity in entities:
-            entity_type = entity["entity_type"]
-            if entity_type not in entities_by_type:
-                entities_by_type[entity_type] = []
-            entities_by_type[entity_type].append(entity)
-        
+            entities_by_type[entity["entity_type"]].append(entity)
+
         # Count entities by type
         entity_counts = {
             entity_type: len(entities)
@@ -595,42 +1137,42 @@ class DatabaseHandler:
         Returns:
             A dictionary containing comparison results
         """
-        entities1 = self.get_mp_entities(mp_name1)
-        entities2 = self.get_mp_entities(mp_name2)
-        
+        # Each fetch borrows its own reader connection, so the two MPs'
+        # entity lists load concurrently under WAL
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(self.get_mp_entities, mp_name1)
+            future2 = executor.submit(self.get_mp_entities, mp_name2)
+            entities1 = future1.result()
+            entities2 = future2.result()
+
         # Group entities by type for each MP
-        entities1_by_type = {}
+        entities1_by_type = defaultdict(list)
         for entity in entities1:
-            entity_type = entity["entity_type"]
-            if entity_type not in entities1_by_type:
-                entities1_by_type[entity_type] = []
-            entities1_by_type[entity_type].append(entity)
-        
-        entities2_by_type = {}
+            entities1_by_type[entity["entity_type"]].append(entity)
+
+        entities2_by_type = defaultdict(list)
         for entity in entities2:
-            entity_type = entity["entity_type"]
-            if entity_type not in entities2_by_type:
-                entities2_by_type[entity_type] = []
-            entities2_by_type[entity_type].append(entity)
-        
+            entities2_by_type[entity["entity_type"]].append(entity)
+
         # Find common entity types
-        common_types = set(entities1_by_type.keys()) & set(entities2_by_type.keys())
-        
-        # Find common entities (by normalized name)
+        common_types = set(entities1_by_type) & set(entities2_by_type)
+
+        # Find common entities; canonical_name is already normalized at
+        # insert time, so no re-normalization pass is needed here
         common_entities = []
         for entity_type in common_types:
-            entities1_names = {self._normalize_entity_name(e["canonical_name"]): e for e in entities1_by_type[entity_type]}
-            entities2_names = {self._normalize_entity_name(e["canonical_name"]): e for e in entities2_by_type[entity_type]}
-            
-            common_names = set(entities1_names.keys()) & set(entities2_names.keys())
-            
-            for name in common_names:
-                common_entities.append({
+            entities1_names = {e["canonical_name"]: e for e in entities1_by_type[entity_type]}
+            entities2_names = {e["canonical_name"]: e for e in entities2_by_type[entity_type]}
+
+            common_entities.extend(
+                {
                     "entity_type": entity_type,
                     "canonical_name": name,
                     "mp1_entity": entities1_names[name],
                     "mp2_entity": entities2_names[name]
-                })
+                }
+                for name in entities1_names.keys() & entities2_names.keys()
+            )
         
         return {
             "mp1": mp_name1,
@@ -652,99 +1194,139 @@ class DatabaseHandler:
         Returns:
             A list of matching entities
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         try:
-            # Normalize entity name
-            normalized_name = self._normalize_entity_name(entity_name)
-            
-            # Build query
-            query = "SELECT * FROM entities WHERE canonical_name LIKE ?"
-            params = [f"%{normalized_name}%"]
-            
-            if entity_type:
-                query += " AND entity_type = ?"
-                params.append(entity_type)
-            
-            # Execute query
-            cursor.execute(query, params)
-            entities = [dict(row) for row in cursor.fetchall()]
-            
-            return entities
-            
+            with self._reader() as conn:
+                cursor = conn.cursor()
+
+                # Normalize entity name
+                normalized_name = self._normalize_entity_name(entity_name)
+
+                if not normalized_name:
+                    if entity_type:
+                        cursor.execute(
+                            f"SELECT {_ENTITY_SELECT} FROM entities "
+                            "WHERE entity_type = ?",
+                            (entity_type,))
+                        return [
+                            dict(zip(ENTITY_COLUMNS, row))
+                            for row in cursor.fetchall()]
+                    return []
+
+                # Each token as a quoted prefix query: MATCH resolves from the
+                # FTS index instead of the LIKE '%…%' table scan
+                match_query = " ".join(
+                    f'"{token}"*' for token in normalized_name.split())
+
+                entity_select = ", ".join(f"e.{column}" for column in ENTITY_COLUMNS)
+                query = (
+                    f"SELECT {entity_select} FROM entities_fts f "
+                    "JOIN entities e ON e.id = f.rowid "
+                    "WHERE entities_fts MATCH ?")
+                params = [match_query]
+
+                if entity_type:
+                    query += " AND e.entity_type = ?"
+                    params.append(entity_type)
+
+                # Execute query
+                cursor.execute(query, params)
+                entities = [
+                    dict(zip(ENTITY_COLUMNS, row)) for row in cursor.fetchall()]
+
+                return entities
+
         except Exception as e:
             logger.error(f"Error searching for entity: {str(e)}")
             return []
-            
-        finally:
-            conn.close()
     
     def link_existing_disclosures_to_entities(self):
         """
         Link existing disclosures to entities.
         """
         logger.info("Linking existing disclosures to entities")
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._conn
         cursor = conn.cursor()
-        
-        try:
-            # Get all disclosures without entity_id
-            cursor.execute(
-                """
-                SELECT id, mp_name, category, entity, item, declaration_date
-                FROM disclosures
-                WHERE entity_id IS NULL
-                """
-            )
-            
-            disclosures = cursor.fetchall()
-            logger.info(f"Found {len(disclosures)} unlinked disclosures")
-            
-            # Link each disclosure to an entity
-            for disclosure in disclosures:
-                disclosure_id, mp_name, category, entity, item, declaration_date = disclosure
-                
-                # If entity is empty but item has a value, use item
-                if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
-                    entity = item
-                
-                # Skip if entity is still N/A or Unknown
-                if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
-                    continue
-                
-                # Find or create entity
-                entity_id = self._find_or_create_entity(
-                    cursor, 
-                    mp_name, 
-                    category, 
-                    entity, 
-                    declaration_date
-                )
-                
-                # Update disclosure with entity_id
-                if entity_id:
-                    cursor.execute(
-                        """
-                        UPDATE disclosures
-                        SET entity_id = ?
-                        WHERE id = ?
-                        """,
-                        (entity_id, disclosure_id)
-                    )
-            
-            # Commit transaction
-            conn.commit()
-            
-            logger.info("Successfully linked existing disclosures to entities")
-            
-        except Exception as e:
-            # Rollback transaction on error
-            conn.rollback()
-            logger.error(f"Error linking disclosures to entities: {str(e)}")
-            raise
-            
-        finally:
-            conn.close() 
\ No newline at end of file
+
+        with self._lock:
+            try:
+                self._link_disclosures(conn, cursor)
+            except Exception as e:
+                # Rollback transaction on error
+                conn.rollback()
+                logger.error(f"Error linking disclosures to entities: {str(e)}")
+                raise
+
+    def _link_disclosures(self, conn, cursor):
+        """
+        Link unlinked disclosures to entities. Caller holds the write lock.
+        """
+        # The whole pass is three set-based statements: nothing crosses the
+        # Python/C boundary per row, and the normalize_name SQL function
+        # keeps name matching identical to the insert path
+        name_expr = _LINK_NAME_EXPR.format(t="d")
+        known_date = ("CASE WHEN d.declaration_date != 'Unknown' "
+                      "THEN d.declaration_date END")
+
+        # Begin transaction
+        conn.execute("BEGIN TRANSACTION")
+
+        # Create the entities that don't exist yet, one grouped scan
+        cursor.execute(f"""
+            INSERT INTO entities
+            (entity_type, canonical_name, first_appearance_date,
+             last_appearance_date, is_active, confidence_score, mp_id, notes)
+            SELECT MIN(d.category), normalize_name({name_expr}) AS norm_name,
+                   COALESCE(MIN({known_date}), 'Unknown'),
+                   COALESCE(MAX({known_date}), 'Unknown'),
+                   1, 1.0, d.mp_name, ''
+            FROM disclosures d
+            WHERE d.entity_id IS NULL
+              AND ({name_expr}) IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM entities e
+                  WHERE e.mp_id = d.mp_name
+                    AND e.canonical_name = normalize_name({name_expr}))
+            GROUP BY d.mp_name, norm_name
+            """)
+        created_count = cursor.rowcount
+
+        # Bump last_appearance_date where the incoming dates are newer
+        cursor.execute(f"""
+            UPDATE entities SET
+                last_appearance_date = u.max_date,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT d.mp_name AS mp_name,
+                       normalize_name({name_expr}) AS norm_name,
+                       MAX({known_date}) AS max_date
+                FROM disclosures d
+                WHERE d.entity_id IS NULL AND ({name_expr}) IS NOT NULL
+                GROUP BY d.mp_name, norm_name
+            ) u
+            WHERE entities.mp_id = u.mp_name
+              AND entities.canonical_name = u.norm_name
+              AND u.max_date IS NOT NULL
+              AND (entities.last_appearance_date IS NULL
+                   OR entities.last_appearance_date IN ('', 'Unknown')
+                   OR u.max_date > entities.last_appearance_date)
+            """)
+
+        # Point each unlinked disclosure at its MP's entity
+        main_expr = _LINK_NAME_EXPR.format(t="disclosures")
+        cursor.execute(f"""
+            UPDATE disclosures SET entity_id = (
+                SELECT e.id FROM entities e
+                WHERE e.mp_id = disclosures.mp_name
+                  AND e.canonical_name = normalize_name({main_expr})
+                LIMIT 1)
+            WHERE entity_id IS NULL AND ({main_expr}) IS NOT NULL
+            """)
+        linked_count = cursor.rowcount
+
+        # Commit transaction
+        conn.commit()
+
+        logger.info(
+            f"Linked {linked_count} disclosures "
+            f"({created_count} entities created)")
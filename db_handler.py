@@ -2,10 +2,16 @@ import os
 import json
 import sqlite3
 import logging
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Optional, Union, Tuple
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 import re
+from collections import defaultdict, Counter
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(
@@ -87,6 +93,494 @@ class TemporalTypes:
 # Import our new item extraction function
 from extract_item_for_db_handler import extract_item_from_details
 
+# rapidfuzz scores category names against the canonical list far more robustly
+# than a substring scan (typos, reordered words); fall back gracefully if it
+# isn't installed
+try:
+    from rapidfuzz import process as _rf_process, fuzz as _rf_fuzz
+except ImportError:
+    _rf_process = None
+    _rf_fuzz = None
+
+# Hot-path SQL hoisted to module level: sqlite3's statement cache is keyed by
+# the exact string, so one stable literal per operation keeps the compiled
+# VDBE program on the execute-only path instead of compile+execute per row
+INSERT_DISCLOSURE_SQL = """
+    INSERT INTO disclosures
+    (id, mp_name, party, electorate, declaration_date, category, sub_category,
+    item, temporal_type, start_date, end_date, details, pdf_url, entity_id, entity)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# normalized_name is a generated column (see _initialize_db), so inserts
+# bind one fewer value and SQLite derives it via the norm_entity UDF
+INSERT_ENTITY_SQL = """
+    INSERT INTO entities
+    (id, entity_type, canonical_name, mp_id)
+    VALUES (?, ?, ?, ?)
+"""
+
+# The UNIQUE(normalized_name, entity_type, mp_id) constraint absorbs
+# duplicates, so a whole batch can be upserted blind: misses insert, hits
+# are no-ops that keep the existing row and its id
+UPSERT_ENTITY_SQL = """
+    INSERT INTO entities
+    (id, entity_type, canonical_name, mp_id)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(normalized_name, entity_type, mp_id) DO NOTHING
+"""
+
+INSERT_RELATIONSHIP_SQL = """
+    INSERT INTO relationships
+    (relationship_id, mp_name, entity, relationship_type, value, date_logged)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_ENTITY_SQL = (
+    "SELECT id FROM entities WHERE normalized_name = ? AND entity_type = ? AND mp_id = ?"
+)
+
+# Bump whenever _initialize_db gains new DDL or column migrations; databases
+# stamped with the current version skip schema work entirely at construction.
+# v2: entities.normalized_name became a generated column
+# v3: canonical_name search indexes for get_entity_by_name
+# v4: entities_fts full-text mirror of canonical_name
+# v5: partial covering indexes for the disclosure pattern rollups
+SCHEMA_VERSION = 5
+
+# Precompiled pieces of _normalize_entity_name, which runs once per entity on
+# the store path and repeatedly inside compare_mp_entities
+_NAME_PREFIXES = ("the ", "a ", "an ")
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+# Dispatch tables for the per-disclosure inference in _prepare_disclosure_rows:
+# one lowered string and a couple of lookups per row instead of an if/elif
+# cascade of substring scans. Tuple order preserves the original precedence.
+_DETAIL_KEYWORD_TO_SUBCAT = (
+    ("mortgage", Subcategories.LIABILITY_MORTGAGE),
+    ("loan", Subcategories.LIABILITY_LOAN),
+    ("credit", Subcategories.LIABILITY_CREDIT),
+)
+
+_CATEGORY_TO_DEFAULT_SUB = {
+    Categories.ASSET: Subcategories.ASSET_OTHER,
+    Categories.LIABILITY: Subcategories.LIABILITY_OTHER,
+    Categories.INCOME: Subcategories.INCOME_OTHER,
+    Categories.MEMBERSHIP: Subcategories.MEMBERSHIP_OTHER,
+    Categories.GIFT: Subcategories.GIFT_OTHER,
+    Categories.TRAVEL: Subcategories.TRAVEL_OTHER,
+}
+
+_CATEGORY_TO_TEMPORAL = {
+    Categories.ASSET: TemporalTypes.ONGOING,
+    Categories.LIABILITY: TemporalTypes.ONGOING,
+    Categories.MEMBERSHIP: TemporalTypes.RECURRING,
+    Categories.GIFT: TemporalTypes.ONE_TIME,
+    Categories.TRAVEL: TemporalTypes.ONE_TIME,
+}
+
+# Income subcategories that mark a recurring payment. By this point
+# sub_category holds a canonical Subcategories value (assigned or defaulted
+# above), so an exact membership test replaces the old substring scans over
+# a lowered copy — zero allocation per row.
+_RECURRING_SUBCATS = frozenset((
+    Subcategories.INCOME_DIVIDEND,
+    Subcategories.INCOME_SALARY,
+))
+
+# Legacy category names as they appeared in older registers, mapped to the
+# canonical value. Feeds both the lowercased Python lookup and the SQL CASE
+# pre-pass in link_existing_disclosures_to_entities.
+_LEGACY_CATEGORY_CASES = {
+    "Liabilities": Categories.LIABILITY,
+    "Savings/Investments": Categories.ASSET,
+    "Partnerships": Categories.MEMBERSHIP,
+    "Directorships": Categories.MEMBERSHIP,
+    "Other Interests": Categories.UNKNOWN,
+}
+
+# Lowercased lookup for malformed categories: legacy aliases resolve with one
+# dict hit, then the standard categories are scanned for a substring match.
+# Replaces the old vars(Categories) reflection loop, which recomputed
+# .lower() on every candidate per row.
+_SPECIAL_CATEGORY_MAPPING = {
+    alias.lower(): canonical for alias, canonical in _LEGACY_CATEGORY_CASES.items()
+}
+
+_CATEGORY_LOWER_LIST = tuple((c.lower(), c) for c in Categories.ALL)
+
+# Keyword tables for the standardization pass: one compiled alternation scan
+# of details per category instead of a chain of substring walks. findall
+# collects every hit in a single pass; the ordered (keyword, subcategory)
+# tuples then decide priority, matching the old elif ordering.
+_SUBCAT_KEYWORDS = {
+    Categories.ASSET: (
+        re.compile(r'shares|stock|real estate|property|trust'),
+        (
+            ("shares", Subcategories.ASSET_SHARES),
+            ("stock", Subcategories.ASSET_SHARES),
+            ("real estate", Subcategories.ASSET_REAL_ESTATE),
+            ("property", Subcategories.ASSET_REAL_ESTATE),
+            ("trust", Subcategories.ASSET_TRUST),
+        ),
+        Subcategories.ASSET_OTHER,
+    ),
+    Categories.LIABILITY: (
+        re.compile(r'mortgage|loan|credit'),
+        (
+            ("mortgage", Subcategories.LIABILITY_MORTGAGE),
+            ("loan", Subcategories.LIABILITY_LOAN),
+            ("credit", Subcategories.LIABILITY_CREDIT),
+        ),
+        Subcategories.LIABILITY_OTHER,
+    ),
+    Categories.INCOME: (
+        re.compile(r'dividend|salary|wage'),
+        (
+            ("dividend", Subcategories.INCOME_DIVIDEND),
+            ("salary", Subcategories.INCOME_SALARY),
+            ("wage", Subcategories.INCOME_SALARY),
+        ),
+        Subcategories.INCOME_OTHER,
+    ),
+    Categories.MEMBERSHIP: (
+        re.compile(r'director|board|professional'),
+        (
+            ("director", Subcategories.MEMBERSHIP_PROFESSIONAL),
+            ("board", Subcategories.MEMBERSHIP_PROFESSIONAL),
+            ("professional", Subcategories.MEMBERSHIP_PROFESSIONAL),
+        ),
+        Subcategories.MEMBERSHIP_OTHER,
+    ),
+    Categories.TRAVEL: (
+        re.compile(r'flight|air'),
+        (
+            ("flight", Subcategories.TRAVEL_AIR),
+            ("air", Subcategories.TRAVEL_AIR),
+        ),
+        Subcategories.TRAVEL_OTHER,
+    ),
+}
+
+# Gift keywords need compound logic (ticket + sport/entertainment), so the
+# scan is shared but the decision stays explicit
+_GIFT_KEYWORD_RE = re.compile(r'ticket|sport|entertainment|hospitality|dinner|lunch')
+
+
+@lru_cache(maxsize=16384)
+def _infer_subcategory(category: str, details_text: str) -> str:
+    """
+    Infer a subcategory from lowercased details for the standardization pass.
+
+    Pure in its two string arguments, so results are memoized: disclosure
+    details repeat heavily across filings (the same shareholding restated
+    year after year), and a cache hit skips the regex scan entirely.
+
+    Args:
+        category: Canonical category of the disclosure
+        details_text: Lowercased details string (may be empty)
+
+    Returns:
+        The inferred subcategory, or the category's generic fallback
+    """
+    if category == Categories.GIFT:
+        found = set(_GIFT_KEYWORD_RE.findall(details_text))
+        if "ticket" in found and ("sport" in found or "entertainment" in found):
+            return Subcategories.GIFT_ENTERTAINMENT
+        if found & {"hospitality", "dinner", "lunch"}:
+            return Subcategories.GIFT_HOSPITALITY
+        return Subcategories.GIFT_OTHER
+
+    entry = _SUBCAT_KEYWORDS.get(category)
+    if entry is None:
+        return "Other"
+
+    pattern, priorities, default = entry
+    found = set(pattern.findall(details_text))
+    if found:
+        for keyword, sub in priorities:
+            if keyword in found:
+                return sub
+    return default
+
+# One UPDATE that remaps every legacy spelling in place, so the Python loops
+# over existing rows only ever see categories the CASE couldn't fix
+LEGACY_CATEGORY_UPDATE_SQL = (
+    "UPDATE disclosures SET category = CASE category "
+    + " ".join(
+        f"WHEN '{alias}' THEN '{canonical}'"
+        for alias, canonical in _LEGACY_CATEGORY_CASES.items()
+    )
+    + " END WHERE category IN ("
+    + ", ".join(f"'{alias}'" for alias in _LEGACY_CATEGORY_CASES)
+    + ")"
+)
+
+
+# Rows per fetchmany batch in the linking pass
+_LINK_BATCH_SIZE = 10_000
+
+# Ids per IN-list chunk, kept under SQLite's 999 bound-parameter limit
+_IN_CHUNK_SIZE = 900
+
+# Module-level so every executemany binds against the same string object and
+# hits the per-connection statement cache instead of re-parsing
+LINK_DISCLOSURE_SQL = "UPDATE disclosures SET entity_id = ? WHERE id = ?"
+
+STANDARDIZE_DISCLOSURE_SQL = """
+UPDATE disclosures
+SET category = ?, sub_category = ?
+WHERE id = ?
+"""
+
+# The standardization scan only needs rows that can actually change: ones
+# with a missing/invalid category or sub_category. Filtering inside SQLite
+# keeps already-clean rows (the steady state on re-runs) out of the Python
+# loop altogether; missing temporal_type is handled wholesale by
+# TEMPORAL_BACKFILL_SQL below.
+STANDARDIZE_SCAN_SQL = (
+    "SELECT id, category, sub_category, details "
+    "FROM disclosures "
+    "WHERE sub_category IS NULL "
+    "OR category NOT IN ("
+    + ", ".join(f"'{c}'" for c in Categories.ALL)
+    + ") OR (category, sub_category) NOT IN (VALUES "
+    + ", ".join(
+        f"('{cat}', '{sub}')"
+        for cat, subs in Subcategories.MAPPING.items()
+        for sub in subs
+    )
+    + ")"
+)
+
+# temporal_type is a deterministic function of (category, sub_category), so
+# one CASE UPDATE backfills every missing value in a single table scan
+TEMPORAL_BACKFILL_SQL = f"""
+UPDATE disclosures
+SET temporal_type = CASE
+    WHEN category IN ('{Categories.ASSET}', '{Categories.LIABILITY}')
+        THEN '{TemporalTypes.ONGOING}'
+    WHEN category = '{Categories.INCOME}'
+        AND sub_category IN ('{Subcategories.INCOME_DIVIDEND}', '{Subcategories.INCOME_SALARY}')
+        THEN '{TemporalTypes.RECURRING}'
+    WHEN category = '{Categories.MEMBERSHIP}' THEN '{TemporalTypes.RECURRING}'
+    ELSE '{TemporalTypes.ONE_TIME}'
+END
+WHERE temporal_type IS NULL
+"""
+
+
+def _normalize_category(category: str) -> str:
+    """
+    Map an arbitrary category string onto its canonical Categories value.
+
+    Exact matches pass through, legacy aliases resolve via one dict lookup,
+    anything else goes through rapidfuzz scoring (when available) and then a
+    substring scan of the canonical names, finally falling back to Unknown.
+
+    Args:
+        category: The raw category string
+
+    Returns:
+        A member of Categories.ALL
+    """
+    if category in Categories.ALL:
+        return category
+
+    cat_low = category.lower()
+    matched = _SPECIAL_CATEGORY_MAPPING.get(cat_low)
+    if matched is None and _rf_process is not None:
+        best = _rf_process.extractOne(
+            category, Categories.ALL, scorer=_rf_fuzz.partial_ratio, score_cutoff=80
+        )
+        if best is not None:
+            matched = best[0]
+    if matched is None:
+        matched = next(
+            (c for low, c in _CATEGORY_LOWER_LIST if cat_low in low),
+            None
+        )
+
+    if matched is None:
+        logger.warning(f"Could not match '{category}' to standard category. Using 'Unknown'.")
+        return Categories.UNKNOWN
+    return matched
+
+
+def _bulk_uuid4(count: int) -> List[str]:
+    """
+    Generate `count` random UUID strings from a single os.urandom read.
+
+    uuid.uuid4() pulls 16 bytes from the OS per call; at batch scale that is
+    one syscall per row. One read of 16*count bytes sliced into UUID objects
+    (version=4 sets the variant/version bits) amortizes it to one syscall
+    per batch.
+    """
+    if count <= 0:
+        return []
+    blob = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=blob[offset:offset + 16], version=4))
+        for offset in range(0, 16 * count, 16)
+    ]
+
+
+@lru_cache(maxsize=8192)
+def _normalize_name(entity_name: str) -> str:
+    """
+    Normalize an entity name for consistent matching.
+
+    Module-level (not a method) so worker processes can run it without
+    pickling a handler; DatabaseHandler._normalize_entity_name delegates
+    here and the norm_entity UDF is registered against it. The same names
+    recur constantly in bulk linking and search, so results sit behind a
+    bounded LRU.
+
+    Args:
+        entity_name: The entity name to normalize
+
+    Returns:
+        Normalized entity name
+    """
+    # Skip if None or empty
+    if not entity_name:
+        return ""
+
+    # Convert to lowercase
+    normalized = entity_name.lower()
+
+    # Remove common prefixes
+    for prefix in _NAME_PREFIXES:
+        if normalized.startswith(prefix):
+            normalized = normalized[len(prefix):]
+
+    # Remove punctuation and extra spaces
+    normalized = _PUNCT_RE.sub(' ', normalized)
+    normalized = _WS_RE.sub(' ', normalized).strip()
+
+    return normalized
+
+
+def connect(db_path: str = "disclosures.db") -> sqlite3.Connection:
+    """
+    Open a connection with the norm_entity UDF registered.
+
+    entities.normalized_name is generated by norm_entity, so any statement
+    that writes the entities table (the UNIQUE index over the column is
+    re-derived on write) or reads normalized_name needs the function on its
+    connection. Maintenance scripts that would otherwise call
+    sqlite3.connect directly must use this factory or their entity updates
+    fail with "unknown function: norm_entity".
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        A connection with the UDF registered and a busy timeout set
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.create_function("norm_entity", 1, _normalize_name,
+                         deterministic=True)
+    return conn
+
+
+def _prepare_disclosures(disclosures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply category, subcategory, and temporal-type rules to raw disclosures.
+
+    Pure CPU work with no database handle, so the batch path can map it over
+    a process pool; the single-record path calls it inline. Each returned
+    dict carries an "entity_key" of (normalized_name, category) — or None
+    when no entity applies — for the bulk entity resolution that follows.
+
+    Args:
+        disclosures: Raw disclosure dictionaries
+
+    Returns:
+        Normalized disclosure dictionaries ready for row assembly
+    """
+    prepared = []
+    for disclosure in disclosures:
+        declaration_date = disclosure.get("declaration_date", "Unknown")
+
+        # Get category info
+        category = disclosure.get("category", "Unknown")
+
+        # Enforce category standards
+        if category not in Categories.ALL:
+            logger.warning(f"Invalid category '{category}' detected. Converting to appropriate category if possible.")
+            category = _normalize_category(category)
+
+        # Handle subcategory
+        sub_category = disclosure.get("sub_category", "")
+        details = disclosure.get("details", "")
+
+        # If no subcategory provided but we can infer it
+        if not sub_category and category in Categories.ALL:
+            # Check if the disclosure details help determine subcategory
+            details_low = details.lower()
+            for keyword, keyword_sub in _DETAIL_KEYWORD_TO_SUBCAT:
+                if keyword in details_low:
+                    sub_category = keyword_sub
+                    break
+            else:
+                if "ticket" in details_low and "sport" in details_low:
+                    sub_category = Subcategories.GIFT_ENTERTAINMENT
+
+            # Default to generic subcategory if needed
+            if not sub_category:
+                sub_category = _CATEGORY_TO_DEFAULT_SUB.get(category, "")
+
+        # Item and entity information
+        entity = disclosure.get("entity", "Unknown")
+        pdf_url = disclosure.get("pdf_url", "")
+        item = extract_item_from_details(category, sub_category, entity, details)
+
+        # Determine temporal type based on category
+        temporal_type = disclosure.get("temporal_type", "")
+        if not temporal_type:
+            if category == Categories.INCOME:
+                if sub_category in _RECURRING_SUBCATS:
+                    temporal_type = TemporalTypes.RECURRING
+                else:
+                    temporal_type = TemporalTypes.ONE_TIME
+            else:
+                temporal_type = _CATEGORY_TO_TEMPORAL.get(category, TemporalTypes.ONE_TIME)
+
+        # Start and end dates (if available)
+        start_date = disclosure.get("start_date", declaration_date)
+        end_date = disclosure.get("end_date", "")
+
+        # Entities are resolved in bulk after this pass; record the key
+        if entity and entity != "Unknown":
+            entity_key = (_normalize_name(entity), category)
+        else:
+            entity_key = None
+
+        prepared.append({
+            "declaration_date": declaration_date,
+            "category": category,
+            "sub_category": sub_category,
+            "item": item,
+            "temporal_type": temporal_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "details": details,
+            "pdf_url": pdf_url,
+            "entity": entity,
+            "entity_key": entity_key
+        })
+
+    return prepared
+
+
+# Batches at or above this size fan pass-1 preparation out to a process
+# pool; below it, worker startup costs more than the work
+_PARALLEL_PREPARE_MIN_RECORDS = 32
+
+
 class DatabaseHandler:
     """
     A class to handle database operations for storing structured data.
@@ -100,17 +594,98 @@ class DatabaseHandler:
             db_path: Path to the SQLite database file.
         """
         self.db_path = db_path
+        self._local = threading.local()
+        # Read caches keyed by a cheap version stamp (see _db_version); hit
+        # by analytics paths that re-request the same MP or entity
+        self._mp_entities_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._entity_timeline_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
         self._initialize_db()
-    
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Return this thread's cached connection, opening it on first use.
+
+        Connection setup (file open, header parse, schema load) is a
+        measurable per-call tax, and a fresh connection starts with a cold
+        page cache. Each thread keeps one long-lived connection instead.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # cached_statements enlarges the built-in per-connection LRU so
+            # the hot INSERT/SELECT programs stay compiled across batches
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=512)
+            self._configure_connection(conn)
+            self._local.conn = conn
+        return conn
+
+    def _db_version(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """
+        Return a cheap stamp that changes whenever the database does.
+
+        PRAGMA data_version is a single integer read that bumps when another
+        connection commits; it does NOT move for writes made on this same
+        connection, so the connection's own total_changes counter is paired
+        with it to cover both cases.
+        """
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, conn.total_changes)
+
+    def close(self) -> None:
+        """
+        Close this thread's cached connection, if one is open.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """
+        Apply the performance PRAGMA set to a new connection.
+
+        WAL with synchronous=NORMAL removes the per-commit journal churn that
+        dominates the write-heavy store path and lets readers run alongside
+        the writer. The settings are file-level or per-connection; they are
+        skipped for in-memory databases where they don't apply.
+
+        Args:
+            conn: Connection to configure
+        """
+        if self.db_path == ":memory:":
+            return
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        # Expose the Python normalizer to SQL so linking/backfill queries can
+        # match entities without pulling rows into Python; deterministic lets
+        # SQLite cache results within a statement
+        conn.create_function("norm_entity", 1, _normalize_name,
+                             deterministic=True)
+
     def _initialize_db(self):
         """
         Initialize the database schema if it doesn't exist.
+
+        A PRAGMA user_version stamp gates the whole block: the handler is
+        constructed by every worker, and once the schema is current the six
+        table_info/ALTER probes below are pure overhead.
         """
-        logger.info(f"Initializing database at {self.db_path}")
-        
         conn = sqlite3.connect(self.db_path)
+        self._configure_connection(conn)
         cursor = conn.cursor()
-        
+
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] == SCHEMA_VERSION:
+            conn.close()
+            return
+
+        logger.info(f"Initializing database at {self.db_path}")
+
         # Create disclosures table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS disclosures (
@@ -135,17 +710,48 @@ class DatabaseHandler:
         )
         ''')
         
-        # Create entities table
+        # Create entities table. normalized_name is derived from
+        # canonical_name by the norm_entity UDF (registered deterministic in
+        # _configure_connection, which SQLite requires for generated
+        # columns), so inserts never bind it and it can't drift from the
+        # canonical value. VIRTUAL keeps it out of the row payload; the
+        # UNIQUE index below materializes it for lookups.
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS entities (
             id TEXT PRIMARY KEY,
             entity_type TEXT,
             canonical_name TEXT,
-            normalized_name TEXT,
+            normalized_name TEXT GENERATED ALWAYS AS (norm_entity(canonical_name)) VIRTUAL,
             mp_id TEXT,
             UNIQUE (normalized_name, entity_type, mp_id)
         )
         ''')
+
+        # Databases from schema v1 carry normalized_name as a stored column;
+        # rebuild the table around the generated definition. table_xinfo
+        # reports hidden=2 for virtual generated columns, 0 for stored ones.
+        cursor.execute("PRAGMA table_xinfo(entities)")
+        normalized_hidden = next(
+            (col[6] for col in cursor.fetchall() if col[1] == "normalized_name"), None
+        )
+        if normalized_hidden == 0:
+            logger.info("Migrating entities.normalized_name to a generated column")
+            cursor.execute('''
+            CREATE TABLE entities_new (
+                id TEXT PRIMARY KEY,
+                entity_type TEXT,
+                canonical_name TEXT,
+                normalized_name TEXT GENERATED ALWAYS AS (norm_entity(canonical_name)) VIRTUAL,
+                mp_id TEXT,
+                UNIQUE (normalized_name, entity_type, mp_id)
+            )
+            ''')
+            cursor.execute('''
+            INSERT INTO entities_new (id, entity_type, canonical_name, mp_id)
+            SELECT id, entity_type, canonical_name, mp_id FROM entities
+            ''')
+            cursor.execute("DROP TABLE entities")
+            cursor.execute("ALTER TABLE entities_new RENAME TO entities")
         
         # Create relationships table
         cursor.execute('''
@@ -186,7 +792,80 @@ class DatabaseHandler:
         if "end_date" not in columns:
             logger.info("Adding end_date column to disclosures table")
             cursor.execute("ALTER TABLE disclosures ADD COLUMN end_date TEXT")
-        
+
+        # Indexes for the read hot paths; without them every lookup below is
+        # a full table scan that grows linearly with the database
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disclosures_entity_id ON disclosures(entity_id)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disclosures_mp_name "
+            "ON disclosures(mp_name, declaration_date)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_relationships_mp_name ON relationships(mp_name)")
+        # Matches the entity-resolution WHERE clause exactly, turning the
+        # per-batch probe into a single B-tree descent
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entities_mp_type_name "
+            "ON entities(mp_id, entity_type, normalized_name)")
+        # NOCASE collation lets the default (case-insensitive) LIKE rewrite
+        # prefix patterns into index range scans in get_entity_by_name
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entities_name "
+            "ON entities(canonical_name COLLATE NOCASE)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entities_type_name "
+            "ON entities(entity_type, canonical_name COLLATE NOCASE)")
+        # Partial covering indexes for the get_disclosure_patterns rollups:
+        # grouping becomes an index scan instead of a sort of the whole table
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disc_cat_sub_tt_date "
+            "ON disclosures(category, sub_category, temporal_type, declaration_date) "
+            "WHERE category IS NOT NULL")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disc_entity_cat "
+            "ON disclosures(entity_id, category, declaration_date) "
+            "WHERE entity_id IS NOT NULL")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_disc_mp ON disclosures(mp_name)")
+
+        # External-content FTS5 mirror of canonical_name for the fuzzy search
+        # in get_entity_by_name: an inverted index replaces the un-indexable
+        # LIKE '%x%' table scan. Triggers keep it in sync with writes; the
+        # rebuild below (re)populates it whenever this migration block runs.
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+            canonical_name,
+            content='entities',
+            content_rowid='rowid'
+        )
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN
+            INSERT INTO entities_fts(rowid, canonical_name)
+            VALUES (new.rowid, new.canonical_name);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN
+            INSERT INTO entities_fts(entities_fts, rowid, canonical_name)
+            VALUES ('delete', old.rowid, old.canonical_name);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE ON entities BEGIN
+            INSERT INTO entities_fts(entities_fts, rowid, canonical_name)
+            VALUES ('delete', old.rowid, old.canonical_name);
+            INSERT INTO entities_fts(rowid, canonical_name)
+            VALUES (new.rowid, new.canonical_name);
+        END
+        ''')
+        cursor.execute("INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')")
+        # Populate sqlite_stat1 so the planner picks these indexes
+        cursor.execute("ANALYZE")
+
+        # Stamp the schema so future constructions skip all of the above
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
         conn.commit()
         conn.close()
     
@@ -201,185 +880,174 @@ class DatabaseHandler:
             A list of IDs for the inserted disclosure records.
         """
         logger.info(f"Storing structured data for MP: {structured_data.get('mp_name', 'Unknown')}")
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         try:
             # Begin transaction
             conn.execute("BEGIN TRANSACTION")
-            
-            # Get MP information
-            mp_name = structured_data.get("mp_name", "Unknown")
-            party = structured_data.get("party", "Unknown")
-            electorate = structured_data.get("electorate", "Unknown")
-            
-            # Store disclosures
-            disclosure_ids = []
-            disclosures = structured_data.get("disclosures", [])
-            
-            for disclosure in disclosures:
-                disclosure_id = str(uuid.uuid4())
-                declaration_date = disclosure.get("declaration_date", "Unknown")
-                
-                # Get category info
-                category = disclosure.get("category", "Unknown")
-                
-                # Enforce category standards
-                if category not in Categories.ALL:
-                    logger.warning(f"Invalid category '{category}' detected. Converting to appropriate category if possible.")
-                    # Try to determine the most appropriate category
-                    matched = False
-                    
-                    # Special case mapping for common legacy categories
-                    special_mapping = {
-                        "Liabilities": Categories.LIABILITY,
-                        "Savings/Investments": Categories.ASSET,
-                        "Partnerships": Categories.MEMBERSHIP,
-                        "Directorships": Categories.MEMBERSHIP,
-                        "Other Interests": Categories.UNKNOWN
-                    }
-                    
-                    if category in special_mapping:
-                        category = special_mapping[category]
-                        matched = True
-                    else:
-                        # Try general matching
-                        for cat_name, cat_value in vars(Categories).items():
-                            if cat_name.isupper() and isinstance(cat_value, str):
-                                if category.lower() in cat_value.lower():
-                                    category = cat_value
-                                    matched = True
-                                    break
-                    
-                    if not matched:
-                        logger.warning(f"Could not match to standard category. Using 'Unknown'.")
-                        category = Categories.UNKNOWN
-                
-                # Handle subcategory
-                sub_category = disclosure.get("sub_category", "")
-                
-                # If no subcategory provided but we can infer it
-                if not sub_category and category in Categories.ALL:
-                    category_mapping = {
-                        "Shares": Subcategories.ASSET_SHARES,
-                        "Real Estate": Subcategories.ASSET_REAL_ESTATE,
-                        "Trust": Subcategories.ASSET_TRUST,
-                        "Directorships": Subcategories.MEMBERSHIP_PROFESSIONAL,
-                        "Hospitality": Subcategories.GIFT_HOSPITALITY
-                    }
-                    
-                    # Check if the disclosure details help determine subcategory
-                    details = disclosure.get("details", "").lower()
-                    if "mortgage" in details:
-                        sub_category = Subcategories.LIABILITY_MORTGAGE
-                    elif "loan" in details:
-                        sub_category = Subcategories.LIABILITY_LOAN
-                    elif "credit" in details:
-                        sub_category = Subcategories.LIABILITY_CREDIT
-                    elif "ticket" in details and "sport" in details:
-                        sub_category = Subcategories.GIFT_ENTERTAINMENT
-                    
-                    # Default to generic subcategory if needed
-                    if not sub_category:
-                        if category == Categories.ASSET:
-                            sub_category = Subcategories.ASSET_OTHER
-                        elif category == Categories.LIABILITY:
-                            sub_category = Subcategories.LIABILITY_OTHER
-                        elif category == Categories.INCOME:
-                            sub_category = Subcategories.INCOME_OTHER
-                        elif category == Categories.MEMBERSHIP:
-                            sub_category = Subcategories.MEMBERSHIP_OTHER
-                        elif category == Categories.GIFT:
-                            sub_category = Subcategories.GIFT_OTHER
-                        elif category == Categories.TRAVEL:
-                            sub_category = Subcategories.TRAVEL_OTHER
-                
-                # Item and entity information
-                entity = disclosure.get("entity", "Unknown")
-                details = disclosure.get("details", "")
-                pdf_url = disclosure.get("pdf_url", "")
-                item = extract_item_from_details(category, sub_category, entity, details)
-                
-                # Determine temporal type based on category
-                temporal_type = disclosure.get("temporal_type", "")
-                if not temporal_type:
-                    if category == Categories.ASSET:
-                        temporal_type = TemporalTypes.ONGOING
-                    elif category == Categories.LIABILITY:
-                        temporal_type = TemporalTypes.ONGOING
-                    elif category == Categories.INCOME:
-                        if sub_category and isinstance(sub_category, str) and ("dividend" in sub_category.lower() or "salary" in sub_category.lower()):
-                            temporal_type = TemporalTypes.RECURRING
-                        else:
-                            temporal_type = TemporalTypes.ONE_TIME
-                    elif category == Categories.MEMBERSHIP:
-                        temporal_type = TemporalTypes.RECURRING
-                    elif category == Categories.GIFT or category == Categories.TRAVEL:
-                        temporal_type = TemporalTypes.ONE_TIME
-                    else:
-                        temporal_type = TemporalTypes.ONE_TIME  # Default
-                
-                # Start and end dates (if available)
-                start_date = disclosure.get("start_date", declaration_date)
-                end_date = disclosure.get("end_date", "")
-                
-                # Find or create entity
-                entity_id = self._find_or_create_entity(
-                    cursor, 
-                    mp_name, 
-                    category, 
-                    entity,
-                    declaration_date
-                )
-                
-                cursor.execute(
-                    """
-                    INSERT INTO disclosures 
-                    (id, mp_name, party, electorate, declaration_date, category, sub_category, 
-                    item, temporal_type, start_date, end_date, details, pdf_url, entity_id, entity) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (disclosure_id, mp_name, party, electorate, declaration_date, category, sub_category, 
-                    item, temporal_type, start_date, end_date, details, pdf_url, entity_id, entity)
-                )
-                
-                disclosure_ids.append(disclosure_id)
-            
-            # Store relationships
-            relationships = structured_data.get("relationships", [])
-            
-            for relationship in relationships:
-                relationship_id = str(uuid.uuid4())
-                entity = relationship.get("entity", "Unknown")
-                relationship_type = relationship.get("relationship_type", "Unknown")
-                value = relationship.get("value", "Undisclosed")
-                date_logged = relationship.get("date_logged", "Unknown")
-                
-                cursor.execute(
-                    """
-                    INSERT INTO relationships 
-                    (relationship_id, mp_name, entity, relationship_type, value, date_logged) 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (relationship_id, mp_name, entity, relationship_type, value, date_logged)
-                )
-            
+
+            disclosure_ids = self._store_record(cursor, structured_data)
+
             # Commit transaction
             conn.commit()
-            
-            logger.info(f"Successfully stored structured data for MP: {mp_name}")
+
+            logger.info(f"Successfully stored structured data for MP: {structured_data.get('mp_name', 'Unknown')}")
             return disclosure_ids
-            
+
         except Exception as e:
             # Rollback transaction on error
             conn.rollback()
             logger.error(f"Error storing structured data: {str(e)}")
             raise
-            
-        finally:
-            conn.close()
+
+    def _store_record(self, cursor, structured_data: Dict[str, Any],
+                      prepared: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Insert one structured-data record using an already-open cursor.
+
+        The caller owns the transaction; this helper only issues the batched
+        inserts so it can be shared by the single-record and batch paths.
+
+        Args:
+            cursor: Database cursor inside an open transaction
+            structured_data: Dictionary containing structured data
+            prepared: Pre-normalized disclosures from _prepare_disclosures,
+                when the batch path already ran pass 1 out of process
+
+        Returns:
+            A list of IDs for the inserted disclosure records.
+        """
+        # Get MP information
+        mp_name = structured_data.get("mp_name", "Unknown")
+        party = structured_data.get("party", "Unknown")
+        electorate = structured_data.get("electorate", "Unknown")
+
+        # Store disclosures as one executemany batch
+        disclosures = structured_data.get("disclosures", [])
+        disclosure_ids, disclosure_rows = self._prepare_disclosure_rows(
+            cursor, mp_name, party, electorate, disclosures, prepared=prepared
+        )
+
+        if disclosure_rows:
+            cursor.executemany(INSERT_DISCLOSURE_SQL, disclosure_rows)
+
+        # Store relationships
+        relationships = structured_data.get("relationships", [])
+        relationship_ids = _bulk_uuid4(len(relationships))
+        relationship_rows = [
+            (
+                relationship_ids[i],
+                mp_name,
+                relationship.get("entity", "Unknown"),
+                relationship.get("relationship_type", "Unknown"),
+                relationship.get("value", "Undisclosed"),
+                relationship.get("date_logged", "Unknown")
+            )
+            for i, relationship in enumerate(relationships)
+        ]
+
+        if relationship_rows:
+            cursor.executemany(INSERT_RELATIONSHIP_SQL, relationship_rows)
+
+        return disclosure_ids
     
+    def _prepare_disclosure_rows(self, cursor, mp_name: str, party: str, electorate: str,
+                                 disclosures: List[Dict[str, Any]],
+                                 prepared: Optional[List[Dict[str, Any]]] = None
+                                 ) -> Tuple[List[str], List[Tuple]]:
+        """
+        Normalize a batch of disclosures and resolve their entities in bulk.
+
+        Pass 1 (_prepare_disclosures, CPU-only) applies the category,
+        subcategory, and temporal-type rules to each disclosure; the batch
+        path runs it ahead of time in worker processes and passes the result
+        in. Pass 2 resolves every referenced entity with one SELECT plus one
+        executemany for the misses, instead of a SELECT and optional INSERT
+        per row. The returned rows feed a single executemany.
+
+        Args:
+            cursor: Database cursor
+            mp_name: Name of the MP
+            party: Party of the MP
+            electorate: Electorate of the MP
+            disclosures: Raw disclosure dictionaries
+            prepared: Output of _prepare_disclosures(disclosures), if the
+                caller already computed it
+
+        Returns:
+            A tuple of (disclosure_ids, disclosure_rows)
+        """
+        if prepared is None:
+            prepared = _prepare_disclosures(disclosures)
+
+        # Resolve all referenced entities for the batch at once
+        entity_map = self._resolve_entity_ids(cursor, mp_name, prepared)
+
+        disclosure_ids = _bulk_uuid4(len(prepared))
+        disclosure_rows = []
+        for disclosure_id, p in zip(disclosure_ids, prepared):
+            disclosure_rows.append((
+                disclosure_id, mp_name, party, electorate, p["declaration_date"],
+                p["category"], p["sub_category"], p["item"], p["temporal_type"],
+                p["start_date"], p["end_date"], p["details"], p["pdf_url"],
+                entity_map.get(p["entity_key"]), p["entity"]
+            ))
+
+        return disclosure_ids, disclosure_rows
+
+    def _resolve_entity_ids(self, cursor, mp_name: str,
+                            prepared: List[Dict[str, Any]]) -> Dict[Tuple[str, str], str]:
+        """
+        Find or create every entity referenced by a prepared batch.
+
+        Args:
+            cursor: Database cursor
+            mp_name: Name of the MP
+            prepared: Normalized disclosures; each carries an "entity_key" of
+                (normalized_name, entity_type), or None when no entity applies
+
+        Returns:
+            Dictionary mapping entity keys to entity IDs
+        """
+        canonical_by_key = {}
+        for p in prepared:
+            key = p["entity_key"]
+            if key is not None and key not in canonical_by_key:
+                canonical_by_key[key] = p["entity"]
+
+        entity_map = {}
+        if not canonical_by_key:
+            return entity_map
+
+        # Blind batched upsert: no per-row find-or-create round trips.
+        # sqlite3 can't combine RETURNING with executemany, so the id map
+        # comes from one follow-up SELECT rather than an execute per row.
+        candidate_ids = _bulk_uuid4(len(canonical_by_key))
+        upsert_rows = [
+            (candidate_ids[i], entity_type, canonical_name, mp_name)
+            for i, ((normalized_name, entity_type), canonical_name)
+            in enumerate(canonical_by_key.items())
+        ]
+        cursor.executemany(UPSERT_ENTITY_SQL, upsert_rows)
+
+        # Map keys back to ids with chunked IN-lists to stay under the
+        # bound-parameter limit
+        names = list({key[0] for key in canonical_by_key})
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT id, normalized_name, entity_type FROM entities "
+                f"WHERE mp_id = ? AND normalized_name IN ({placeholders})",
+                [mp_name, *chunk]
+            )
+            for entity_id, normalized_name, entity_type in cursor.fetchall():
+                entity_map[(normalized_name, entity_type)] = entity_id
+
+        return entity_map
+
     def _find_or_create_entity(self, cursor, mp_name, entity_type, canonical_name, first_appearance_date=None):
         """
         Find an existing entity or create a new one.
@@ -401,59 +1069,35 @@ class DatabaseHandler:
         normalized_name = self._normalize_entity_name(canonical_name)
         
         # Look for existing entity
-        cursor.execute(
-            "SELECT id FROM entities WHERE normalized_name = ? AND entity_type = ? AND mp_id = ?",
-            (normalized_name, entity_type, mp_name)
-        )
-        
+        cursor.execute(SELECT_ENTITY_SQL, (normalized_name, entity_type, mp_name))
+
         result = cursor.fetchone()
-        
+
         if result:
             # Found existing entity
             return result[0]
         else:
             # Create new entity
             entity_id = str(uuid.uuid4())
-            
+
             cursor.execute(
-                """
-                INSERT INTO entities 
-                (id, entity_type, canonical_name, normalized_name, mp_id) 
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (entity_id, entity_type, canonical_name, normalized_name, mp_name)
+                INSERT_ENTITY_SQL,
+                (entity_id, entity_type, canonical_name, mp_name)
             )
-            
+
             return entity_id
     
     def _normalize_entity_name(self, entity_name: str) -> str:
         """
         Normalize an entity name for consistent matching.
-        
+
         Args:
             entity_name: The entity name to normalize
-            
+
         Returns:
             Normalized entity name
         """
-        # Skip if None or empty
-        if not entity_name:
-            return ""
-        
-        # Convert to lowercase
-        normalized = entity_name.lower()
-        
-        # Remove common prefixes
-        prefixes = ["the ", "a ", "an "]
-        for prefix in prefixes:
-            if normalized.startswith(prefix):
-                normalized = normalized[len(prefix):]
-        
-        # Remove punctuation and extra spaces
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return _normalize_name(entity_name)
     
     def filter_nil_entries(self, entries: List[Dict[str, Any]], include_nil: bool = False) -> List[Dict[str, Any]]:
         """
@@ -491,19 +1135,23 @@ class DatabaseHandler:
         
         return [entry for entry in entries if not is_nil_entry(entry)]
     
-    def count_nil_entries(self, category: Optional[str] = None) -> Dict[str, int]:
+    def count_nil_entries(self, category: Optional[str] = None,
+                          conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
         """
         Count the number of nil entries in the database.
-        
+
         Args:
             category: Optional category to filter by
-            
+            conn: Optional externally-owned connection to reuse; the
+                thread's pooled connection is used when omitted
+
         Returns:
             Dictionary with counts of nil entries and total entries
         """
-        conn = sqlite3.connect(self.db_path)
+        if conn is None:
+            conn = self._get_conn()
         cursor = conn.cursor()
-        
+
         # Query parameters
         params = []
         category_filter = ""
@@ -529,15 +1177,58 @@ class DatabaseHandler:
         # Count nil entries
         cursor.execute(f"SELECT COUNT(*) FROM disclosures WHERE {nil_condition} {category_filter}", params)
         nil_count = cursor.fetchone()[0]
-        
-        conn.close()
-        
+
         return {
             "nil_entries": nil_count,
             "total_entries": total_count,
             "nil_percentage": round(nil_count / total_count * 100, 2) if total_count > 0 else 0
         }
-    
+
+    def count_nil_entries_by_category(self,
+                                      conn: Optional[sqlite3.Connection] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Count nil entries for every category in a single query.
+
+        Args:
+            conn: Optional externally-owned connection to reuse; the
+                thread's pooled connection is used when omitted
+
+        Returns:
+            Dictionary mapping each category to its nil/total counts
+        """
+        if conn is None:
+            conn = self._get_conn()
+        cursor = conn.cursor()
+
+        # SQL condition for nil entries (same predicate as count_nil_entries)
+        nil_condition = """
+            (
+                (item IS NULL OR item = '' OR LOWER(item) IN ('n/a', 'nil', 'none', 'not applicable', 'unknown'))
+                AND
+                (entity IS NULL OR entity = '' OR LOWER(entity) IN ('n/a', 'nil', 'none', 'not applicable', 'unknown'))
+                AND
+                (details IS NULL OR details = '' OR LOWER(details) IN ('n/a', 'nil', 'none', 'not applicable', 'unknown'))
+            )
+        """
+
+        cursor.execute(f"""
+            SELECT category,
+                   SUM(CASE WHEN {nil_condition} THEN 1 ELSE 0 END) as nil_count,
+                   COUNT(*) as total_count
+            FROM disclosures
+            GROUP BY category
+        """)
+
+        counts = {}
+        for category, nil_count, total_count in cursor.fetchall():
+            counts[category] = {
+                "nil_entries": nil_count,
+                "total_entries": total_count,
+                "nil_percentage": round(nil_count / total_count * 100, 2) if total_count > 0 else 0
+            }
+
+        return counts
+
     def batch_store_structured_data(self, structured_data_list: List[Dict[str, Any]]) -> List[List[str]]:
         """
         Store multiple structured data records in the database.
@@ -549,17 +1240,71 @@ class DatabaseHandler:
             A list of lists of disclosure IDs for the inserted records.
         """
         logger.info(f"Batch storing {len(structured_data_list)} structured data records")
-        
+
+        # Pass 1 (normalization/inference) is pure Python and GIL-bound, so
+        # for large batches fan it out over a process pool before touching
+        # the database; the write side below stays a single WAL connection,
+        # which is all SQLite allows anyway. Per-record failures during
+        # preparation surface as None and produce the same empty id list the
+        # savepoint path yields for failed inserts.
+        prepared_list: List[Optional[List[Dict[str, Any]]]]
+        if len(structured_data_list) >= _PARALLEL_PREPARE_MIN_RECORDS and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor() as pool:
+                futures = [
+                    pool.submit(_prepare_disclosures, record.get("disclosures", []))
+                    for record in structured_data_list
+                ]
+                prepared_list = []
+                for future in futures:
+                    try:
+                        prepared_list.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Error preparing structured data: {str(e)}")
+                        prepared_list.append(None)
+        else:
+            prepared_list = []
+            for record in structured_data_list:
+                try:
+                    prepared_list.append(_prepare_disclosures(record.get("disclosures", [])))
+                except Exception as e:
+                    logger.error(f"Error preparing structured data: {str(e)}")
+                    prepared_list.append(None)
+
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
         disclosure_ids_list = []
-        
-        for structured_data in structured_data_list:
-            try:
-                disclosure_ids = self.store_structured_data(structured_data)
-                disclosure_ids_list.append(disclosure_ids)
-            except Exception as e:
-                logger.error(f"Error storing structured data: {str(e)}")
-                disclosure_ids_list.append([])
-        
+
+        try:
+            # One transaction for the whole batch: the journal is synced once
+            # instead of once per record. BEGIN IMMEDIATE takes the write lock
+            # up front so the batch can't deadlock against another writer.
+            conn.execute("BEGIN IMMEDIATE")
+
+            for structured_data, prepared in zip(structured_data_list, prepared_list):
+                if prepared is None:
+                    disclosure_ids_list.append([])
+                    continue
+                # SAVEPOINT keeps per-record error isolation inside the batch
+                cursor.execute("SAVEPOINT record")
+                try:
+                    disclosure_ids = self._store_record(cursor, structured_data,
+                                                        prepared=prepared)
+                    cursor.execute("RELEASE record")
+                    disclosure_ids_list.append(disclosure_ids)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO record")
+                    cursor.execute("RELEASE record")
+                    logger.error(f"Error storing structured data: {str(e)}")
+                    disclosure_ids_list.append([])
+
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error in batch store: {str(e)}")
+            raise
+
         return disclosure_ids_list
     
     def export_to_json(self, output_path: str) -> None:
@@ -570,73 +1315,65 @@ class DatabaseHandler:
             output_path: Path to save the JSON file.
         """
         logger.info(f"Exporting database to JSON: {output_path}")
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all MPs
-        cursor.execute("SELECT DISTINCT mp_name FROM disclosures")
-        mp_names = [row[0] for row in cursor.fetchall()]
-        
-        data = {}
-        for mp_name in mp_names:
-            # Get all disclosures for this MP
-            cursor.execute("""
-                SELECT id, mp_name, party, electorate, declaration_date, category, sub_category, 
-                item, temporal_type, start_date, end_date, details, pdf_url, entity
-                FROM disclosures 
-                WHERE mp_name = ?
-            """, (mp_name,))
-            
-            disclosures = []
-            for row in cursor.fetchall():
-                disclosures.append({
-                    "id": row[0],
-                    "mp_name": row[1],
-                    "party": row[2],
-                    "electorate": row[3],
-                    "declaration_date": row[4],
-                    "category": row[5],
-                    "sub_category": row[6],
-                    "item": row[7],
-                    "temporal_type": row[8],
-                    "start_date": row[9],
-                    "end_date": row[10],
-                    "details": row[11],
-                    "pdf_url": row[12],
-                    "entity": row[13]
-                })
-            
-            # Get all relationships for this MP
-            cursor.execute("""
-                SELECT relationship_id, mp_name, entity, relationship_type, value, date_logged
-                FROM relationships 
-                WHERE mp_name = ?
-            """, (mp_name,))
-            
-            relationships = []
-            for row in cursor.fetchall():
-                relationships.append({
-                    "relationship_id": row[0],
-                    "mp_name": row[1],
-                    "entity": row[2],
-                    "relationship_type": row[3],
-                    "value": row[4],
-                    "date_logged": row[5]
-                })
-            
-            # Add to data
-            data[mp_name] = {
-                "disclosures": disclosures,
-                "relationships": relationships
-            }
-        
-        conn.close()
-        
-        # Write to file
+
+        conn = self._get_conn()
+
+        disclosure_cols = (
+            "id", "mp_name", "party", "electorate", "declaration_date", "category",
+            "sub_category", "item", "temporal_type", "start_date", "end_date",
+            "details", "pdf_url", "entity"
+        )
+        relationship_cols = (
+            "relationship_id", "mp_name", "entity", "relationship_type", "value", "date_logged"
+        )
+
+        # Two sequential scans sorted on the same key replace the old
+        # one-DISTINCT-plus-two-queries-per-MP pattern: both cursors advance
+        # in lock-step like a merge join, 1 + 2M statements become 2
+        disc_cursor = conn.cursor()
+        disc_cursor.arraysize = 1000
+        disc_cursor.execute(
+            f"SELECT {', '.join(disclosure_cols)} FROM disclosures ORDER BY mp_name")
+
+        rel_cursor = conn.cursor()
+        rel_cursor.arraysize = 1000
+        rel_cursor.execute(
+            f"SELECT {', '.join(relationship_cols)} FROM relationships ORDER BY mp_name")
+
+        by_mp = itemgetter(1)
+        rel_groups = groupby(rel_cursor, key=by_mp)
+        pending = next(rel_groups, None)
+
+        # Write each MP's record as soon as it is assembled, so resident
+        # memory stays at one MP's rows no matter how large the database is
         with open(output_path, "w") as f:
-            json.dump(data, f, indent=2)
-        
+            f.write("{")
+            first = True
+            for mp_name, rows in groupby(disc_cursor, key=by_mp):
+                disclosures = [dict(zip(disclosure_cols, row)) for row in rows]
+
+                # Advance the relationships scan to this MP; both scans use
+                # SQLite's BINARY collation, which matches Python's str order
+                while pending is not None and pending[0] < mp_name:
+                    pending = next(rel_groups, None)
+                if pending is not None and pending[0] == mp_name:
+                    relationships = [dict(zip(relationship_cols, row)) for row in pending[1]]
+                    pending = next(rel_groups, None)
+                else:
+                    relationships = []
+
+                if first:
+                    first = False
+                else:
+                    f.write(",")
+                f.write(json.dumps(mp_name))
+                f.write(":")
+                json.dump(
+                    {"disclosures": disclosures, "relationships": relationships},
+                    f, separators=(",", ":")
+                )
+            f.write("}")
+
         logger.info(f"Successfully exported database to: {output_path}")
     
     def create_backup(self, backup_path: str) -> None:
@@ -654,21 +1391,19 @@ class DatabaseHandler:
             return
         
         try:
-            # Connect to the current database
-            source_conn = sqlite3.connect(self.db_path)
-            
+            # Reuse this thread's cached connection as the source
+            source_conn = self._get_conn()
+
             # Create a new database connection for the backup
             if os.path.exists(backup_path):
                 logger.info(f"Backup file {backup_path} already exists. It will be overwritten.")
                 os.remove(backup_path)
-            
+
             # Create backup using SQLite's backup feature
             backup_conn = sqlite3.connect(backup_path)
             source_conn.backup(backup_conn)
-            
-            # Close connections
+
             backup_conn.close()
-            source_conn.close()
             
             logger.info(f"Database backup successfully created at {backup_path}")
         except Exception as e:
@@ -685,45 +1420,130 @@ class DatabaseHandler:
         Returns:
             A dictionary containing entity information and its timeline of disclosures
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_conn()
+        version = self._db_version(conn)
+        cached = self._entity_timeline_cache.get(entity_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         cursor = conn.cursor()
-        
+
         try:
             # Get entity information
             cursor.execute("SELECT * FROM entities WHERE id = ?", (entity_id,))
             entity_row = cursor.fetchone()
-            
+
             if not entity_row:
                 logger.warning(f"Entity not found with ID: {entity_id}")
                 return {"entity": {}, "timeline": []}
-                
-            entity = dict(entity_row)
-            
+
+            # dict(zip(...)) with column names hoisted once is cheaper than
+            # constructing a sqlite3.Row per row only to copy it into a dict
+            entity_cols = [d[0] for d in cursor.description]
+            entity = dict(zip(entity_cols, entity_row))
+
             # Get all disclosures for this entity
             cursor.execute(
                 """
-                SELECT * FROM disclosures 
-                WHERE entity_id = ? 
+                SELECT * FROM disclosures
+                WHERE entity_id = ?
                 ORDER BY declaration_date
-                """, 
+                """,
                 (entity_id,)
             )
-            
-            disclosures = [dict(row) for row in cursor.fetchall()]
-            
-            return {
+
+            disclosure_cols = [d[0] for d in cursor.description]
+            disclosures = [dict(zip(disclosure_cols, row)) for row in cursor.fetchall()]
+
+            result = {
                 "entity": entity,
                 "timeline": disclosures
             }
-            
+            self._entity_timeline_cache[entity_id] = (version, result)
+            return result
+
         except Exception as e:
             logger.error(f"Error getting entity timeline: {str(e)}")
             return {"entity": {}, "timeline": []}
-            
-        finally:
-            conn.close()
-    
+
+    def get_entity_timelines_bulk(self, entity_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the timelines of many entities with one query pair per chunk.
+
+        Replaces N get_entity_timeline round-trips (2N queries) with two
+        IN-list queries per chunk of ids; results land in the same
+        version-keyed cache that get_entity_timeline reads, so mixed callers
+        share hits.
+
+        Args:
+            entity_ids: IDs of the entities to fetch
+
+        Returns:
+            A dict mapping each found entity id to its
+            {"entity": ..., "timeline": [...]} record
+        """
+        timelines: Dict[str, Dict[str, Any]] = {}
+
+        if not entity_ids:
+            return timelines
+
+        conn = self._get_conn()
+        version = self._db_version(conn)
+
+        missing = []
+        for entity_id in entity_ids:
+            cached = self._entity_timeline_cache.get(entity_id)
+            if cached is not None and cached[0] == version:
+                timelines[entity_id] = cached[1]
+            else:
+                missing.append(entity_id)
+
+        if not missing:
+            return timelines
+
+        cursor = conn.cursor()
+
+        try:
+            for start in range(0, len(missing), _IN_CHUNK_SIZE):
+                chunk = missing[start:start + _IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+
+                cursor.execute(
+                    f"SELECT * FROM entities WHERE id IN ({placeholders})",
+                    chunk)
+                entity_cols = [d[0] for d in cursor.description]
+                for row in cursor.fetchall():
+                    entity = dict(zip(entity_cols, row))
+                    timelines[entity["id"]] = {
+                        "entity": entity,
+                        "timeline": []
+                    }
+
+                cursor.execute(
+                    f"""
+                    SELECT * FROM disclosures
+                    WHERE entity_id IN ({placeholders})
+                    ORDER BY entity_id, declaration_date
+                    """,
+                    chunk)
+                disclosure_cols = [d[0] for d in cursor.description]
+                for row in cursor:
+                    disclosure = dict(zip(disclosure_cols, row))
+                    record = timelines.get(disclosure["entity_id"])
+                    if record is not None:
+                        record["timeline"].append(disclosure)
+
+            for entity_id in missing:
+                if entity_id in timelines:
+                    self._entity_timeline_cache[entity_id] = (
+                        version, timelines[entity_id])
+
+            return timelines
+
+        except Exception as e:
+            logger.error(f"Error getting bulk entity timelines: {str(e)}")
+            return timelines
+
     def get_mp_entities(self, mp_name: str) -> List[Dict[str, Any]]:
         """
         Get all entities for a specific MP.
@@ -734,31 +1554,34 @@ class DatabaseHandler:
         Returns:
             A list of entities owned by the MP
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_conn()
+        version = self._db_version(conn)
+        cached = self._mp_entities_cache.get(mp_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         cursor = conn.cursor()
-        
+
         try:
             # Get all entities for this MP
             cursor.execute(
                 """
-                SELECT * FROM entities 
-                WHERE mp_id = ? 
+                SELECT * FROM entities
+                WHERE mp_id = ?
                 ORDER BY entity_type, canonical_name
-                """, 
+                """,
                 (mp_name,)
             )
-            
-            entities = [dict(row) for row in cursor.fetchall()]
-            
+
+            cols = [d[0] for d in cursor.description]
+            entities = [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+            self._mp_entities_cache[mp_name] = (version, entities)
             return entities
-            
+
         except Exception as e:
             logger.error(f"Error getting MP entities: {str(e)}")
             return []
-            
-        finally:
-            conn.close()
     
     def get_entity_changes(self, entity_id: str) -> Dict[str, Any]:
         """
@@ -770,57 +1593,87 @@ class DatabaseHandler:
         Returns:
             A dictionary containing analysis of changes over time
         """
-        entity_timeline = self.get_entity_timeline(entity_id)
-        entity = entity_timeline["entity"]
-        timeline = entity_timeline["timeline"]
-        
-        if not entity or not timeline:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM entities WHERE id = ?", (entity_id,))
+        entity_row = cursor.fetchone()
+        entity_cols = [d[0] for d in cursor.description]
+
+        cursor.execute(
+            """
+            SELECT MIN(declaration_date), MAX(declaration_date), COUNT(*)
+            FROM disclosures WHERE entity_id = ?
+            """,
+            (entity_id,)
+        )
+        first_appearance, last_appearance, num_appearances = cursor.fetchone()
+
+        if not entity_row or not num_appearances:
             return {
                 "entity_id": entity_id,
                 "error": "Entity or timeline not found"
             }
-        
-        # Sort timeline by declaration date
-        timeline = sorted(timeline, key=lambda x: x["declaration_date"])
-        
-        # Analyze changes
+
+        # Diff consecutive disclosures with LAG() window functions so only the
+        # rows that actually changed ever leave the engine; IS NOT is the
+        # NULL-safe equivalent of the old Python != comparisons
+        cursor.execute(
+            """
+            SELECT declaration_date, details, category, sub_category,
+                   prev_details, prev_category, prev_sub
+            FROM (
+                SELECT declaration_date, details, category, sub_category,
+                       LAG(details) OVER w AS prev_details,
+                       LAG(category) OVER w AS prev_category,
+                       LAG(sub_category) OVER w AS prev_sub,
+                       ROW_NUMBER() OVER w AS row_num
+                FROM disclosures
+                WHERE entity_id = ?
+                WINDOW w AS (ORDER BY declaration_date)
+            )
+            WHERE row_num > 1
+              AND (details IS NOT prev_details
+                   OR category IS NOT prev_category
+                   OR sub_category IS NOT prev_sub)
+            ORDER BY declaration_date
+            """,
+            (entity_id,)
+        )
+
+        # Plain tuples, indexed by position: no per-row sqlite3.Row or dict
         changes = []
-        for i in range(1, len(timeline)):
-            prev = timeline[i-1]
-            curr = timeline[i]
-            
-            # Check for changes in details
-            if prev["details"] != curr["details"]:
+        for (date, details, category, sub_category,
+             prev_details, prev_category, prev_sub) in cursor.fetchall():
+            if details != prev_details:
                 changes.append({
                     "type": "details_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["details"],
-                    "to": curr["details"]
+                    "date": date,
+                    "from": prev_details,
+                    "to": details
                 })
-            
-            # Check for changes in category
-            if prev["category"] != curr["category"]:
+
+            if category != prev_category:
                 changes.append({
                     "type": "category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["category"],
-                    "to": curr["category"]
+                    "date": date,
+                    "from": prev_category,
+                    "to": category
                 })
-            
-            # Check for changes in sub_category
-            if prev.get("sub_category") != curr.get("sub_category"):
+
+            if sub_category != prev_sub:
                 changes.append({
                     "type": "sub_category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev.get("sub_category"),
-                    "to": curr.get("sub_category")
+                    "date": date,
+                    "from": prev_sub,
+                    "to": sub_category
                 })
-        
+
         return {
-            "entity": entity,
-            "first_appearance": timeline[0]["declaration_date"] if timeline else None,
-            "last_appearance": timeline[-1]["declaration_date"] if timeline else None,
-            "num_appearances": len(timeline),
+            "entity": dict(zip(entity_cols, entity_row)),
+            "first_appearance": first_appearance,
+            "last_appearance": last_appearance,
+            "num_appearances": num_appearances,
             "changes": changes
         }
     
@@ -876,91 +1729,139 @@ class DatabaseHandler:
         Returns:
             A dictionary containing comparison results
         """
-        entities1 = self.get_mp_entities(mp_name1)
-        entities2 = self.get_mp_entities(mp_name2)
-        
-        # Group entities by type for each MP
-        entities1_by_type = {}
-        for entity in entities1:
-            entity_type = entity["entity_type"]
-            if entity_type not in entities1_by_type:
-                entities1_by_type[entity_type] = []
-            entities1_by_type[entity_type].append(entity)
-        
-        entities2_by_type = {}
-        for entity in entities2:
-            entity_type = entity["entity_type"]
-            if entity_type not in entities2_by_type:
-                entities2_by_type[entity_type] = []
-            entities2_by_type[entity_type].append(entity)
-        
-        # Find common entity types
-        common_types = set(entities1_by_type.keys()) & set(entities2_by_type.keys())
-        
-        # Find common entities (by normalized name)
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT COUNT(CASE WHEN mp_id = ?1 THEN 1 END),
+                   COUNT(CASE WHEN mp_id = ?2 THEN 1 END)
+            FROM entities
+            WHERE mp_id IN (?1, ?2)
+            """,
+            (mp_name1, mp_name2)
+        )
+        count1, count2 = cursor.fetchone()
+
+        # Entities were normalized at insert time, so the intersection is a
+        # self-join on the stored normalized_name — no re-normalization or
+        # Python-side set intersection needed
+        cursor.execute(
+            """
+            SELECT a.entity_type, a.normalized_name,
+                   a.id, a.canonical_name,
+                   b.id, b.canonical_name
+            FROM entities a
+            JOIN entities b
+              ON a.normalized_name = b.normalized_name
+             AND a.entity_type = b.entity_type
+            WHERE a.mp_id = ? AND b.mp_id = ?
+            ORDER BY a.entity_type, a.normalized_name
+            """,
+            (mp_name1, mp_name2)
+        )
+
         common_entities = []
-        for entity_type in common_types:
-            entities1_names = {self._normalize_entity_name(e["canonical_name"]): e for e in entities1_by_type[entity_type]}
-            entities2_names = {self._normalize_entity_name(e["canonical_name"]): e for e in entities2_by_type[entity_type]}
-            
-            common_names = set(entities1_names.keys()) & set(entities2_names.keys())
-            
-            for name in common_names:
-                common_entities.append({
+        for (entity_type, normalized_name,
+             id1, canonical1, id2, canonical2) in cursor.fetchall():
+            common_entities.append({
+                "entity_type": entity_type,
+                "canonical_name": normalized_name,
+                "mp1_entity": {
+                    "id": id1,
                     "entity_type": entity_type,
-                    "canonical_name": name,
-                    "mp1_entity": entities1_names[name],
-                    "mp2_entity": entities2_names[name]
-                })
-        
+                    "canonical_name": canonical1,
+                    "normalized_name": normalized_name,
+                    "mp_id": mp_name1
+                },
+                "mp2_entity": {
+                    "id": id2,
+                    "entity_type": entity_type,
+                    "canonical_name": canonical2,
+                    "normalized_name": normalized_name,
+                    "mp_id": mp_name2
+                }
+            })
+
         return {
             "mp1": mp_name1,
             "mp2": mp_name2,
-            "mp1_entity_count": len(entities1),
-            "mp2_entity_count": len(entities2),
+            "mp1_entity_count": count1,
+            "mp2_entity_count": count2,
             "common_entity_count": len(common_entities),
             "common_entities": common_entities
         }
     
-    def get_entity_by_name(self, entity_name: str, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_entity_by_name(self, entity_name: str, entity_type: Optional[str] = None,
+                           prefix: bool = False) -> List[Dict[str, Any]]:
         """
         Find entities by name.
-        
+
         Args:
             entity_name: Name of the entity to search for
             entity_type: Optional type of entity to filter by
-            
+            prefix: Match names starting with entity_name instead of
+                matching on words; a prefix LIKE becomes an index range
+                scan on idx_entities_name
+
         Returns:
-            A list of matching entities
+            A list of matching entities, best match first in fuzzy mode
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_conn()
         cursor = conn.cursor()
-        
+        cursor.row_factory = sqlite3.Row
+
         try:
             # Normalize entity name
             normalized_name = self._normalize_entity_name(entity_name)
-            
+
+            # An empty name would degrade to LIKE '%%', a full scan that
+            # returns the whole table; answer it from the type index or not
+            # at all
+            if not normalized_name:
+                if not entity_type:
+                    return []
+                cursor.execute(
+                    "SELECT * FROM entities WHERE entity_type = ?", (entity_type,))
+                return [dict(row) for row in cursor.fetchall()]
+
             # Build query
-            query = "SELECT * FROM entities WHERE canonical_name LIKE ?"
-            params = [f"%{normalized_name}%"]
-            
-            if entity_type:
-                query += " AND entity_type = ?"
-                params.append(entity_type)
-            
+            if prefix:
+                # Type filter first: with idx_entities_type_name SQLite
+                # narrows by type before the LIKE touches any names
+                if entity_type:
+                    query = ("SELECT * FROM entities WHERE entity_type = ? "
+                             "AND canonical_name LIKE ?")
+                    params = [entity_type, f"{normalized_name}%"]
+                else:
+                    query = "SELECT * FROM entities WHERE canonical_name LIKE ?"
+                    params = [f"{normalized_name}%"]
+            else:
+                # Fuzzy mode goes through the entities_fts inverted index:
+                # sub-linear in table size and ranked by bm25, where the old
+                # LIKE '%x%' scanned every row. The quoted term with a
+                # trailing * matches word prefixes anywhere in the name.
+                match = '"{}"*'.format(normalized_name.replace('"', '""'))
+                query = (
+                    "SELECT e.* FROM entities_fts f "
+                    "JOIN entities e ON e.rowid = f.rowid "
+                    "WHERE entities_fts MATCH ?"
+                )
+                params = [match]
+                if entity_type:
+                    query += " AND e.entity_type = ?"
+                    params.append(entity_type)
+                query += " ORDER BY f.rank"
+
             # Execute query
             cursor.execute(query, params)
             entities = [dict(row) for row in cursor.fetchall()]
-            
+
             return entities
-            
+
         except Exception as e:
             logger.error(f"Error searching for entity: {str(e)}")
             return []
-            
-        finally:
-            conn.close()
     
     def link_existing_disclosures_to_entities(self):
         """
@@ -968,218 +1869,116 @@ class DatabaseHandler:
         """
         logger.info("Linking existing disclosures to entities and standardizing categories")
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        
+        # Reads stream through their own cursor in fetchmany batches so the
+        # full disclosures table is never materialized in Python; the write
+        # cursor stays free for lookups and the flushed executemany batches.
+        read_cursor = conn.cursor()
+        read_cursor.arraysize = _LINK_BATCH_SIZE
+
         try:
+            # One transaction for the whole pass; the per-row UPDATEs are
+            # collected and issued as executemany batches instead of a
+            # prepared statement and commit cycle per row
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Remap the known legacy category spellings in one UPDATE so the
+            # loops below only see values the CASE couldn't fix. (Databases
+            # created with the current CHECK constraint can't hold these, but
+            # older ones predate it.)
+            cursor.execute(LEGACY_CATEGORY_UPDATE_SQL)
+
             # Get all disclosures without entity_id
-            cursor.execute(
+            read_cursor.execute(
                 """
                 SELECT id, mp_name, category, entity, item, declaration_date
                 FROM disclosures
                 WHERE entity_id IS NULL
                 """
             )
-            
-            unlinked_disclosures = cursor.fetchall()
-            logger.info(f"Found {len(unlinked_disclosures)} unlinked disclosures")
-            
+
             # Link each disclosure to an entity
             linked_count = 0
-            for disclosure in unlinked_disclosures:
-                disclosure_id, mp_name, category, entity, item, declaration_date = disclosure
-                
-                # If entity is empty but item has a value, use item
-                if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
-                    entity = item
-                
-                # Skip if entity is still N/A or Unknown
-                if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
-                    continue
-                
-                # Ensure category is valid
-                original_category = category
-                if category not in Categories.ALL:
-                    # Try to determine the most appropriate category
-                    matched = False
-                    
-                    # Special case mapping for common legacy categories
-                    special_mapping = {
-                        "Liabilities": Categories.LIABILITY,
-                        "Savings/Investments": Categories.ASSET,
-                        "Partnerships": Categories.MEMBERSHIP,
-                        "Directorships": Categories.MEMBERSHIP,
-                        "Other Interests": Categories.UNKNOWN
-                    }
-                    
-                    if category in special_mapping:
-                        category = special_mapping[category]
-                        matched = True
-                    else:
-                        # Try general matching
-                        for cat_name, cat_value in vars(Categories).items():
-                            if cat_name.isupper() and isinstance(cat_value, str):
-                                if category.lower() in cat_value.lower():
-                                    category = cat_value
-                                    matched = True
-                                    break
-                    
-                    if not matched:
-                        logger.warning(f"Could not match '{category}' to standard category. Using 'Unknown'.")
-                        category = Categories.UNKNOWN
-                
-                # Find or create entity
-                entity_id = self._find_or_create_entity(
-                    cursor, 
-                    mp_name, 
-                    category, 
-                    entity, 
-                    declaration_date
-                )
-                
-                # Update disclosure with entity_id
-                if entity_id:
-                    cursor.execute(
-                        """
-                        UPDATE disclosures
-                        SET entity_id = ?
-                        WHERE id = ?
-                        """,
-                        (entity_id, disclosure_id)
+            link_rows = []
+            while rows := read_cursor.fetchmany():
+                for disclosure in rows:
+                    disclosure_id, mp_name, category, entity, item, declaration_date = disclosure
+
+                    # If entity is empty but item has a value, use item
+                    if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
+                        entity = item
+
+                    # Skip if entity is still N/A or Unknown
+                    if not entity or entity.lower() in ['n/a', 'unknown', 'nil', '']:
+                        continue
+
+                    # Ensure category is valid
+                    original_category = category
+                    category = _normalize_category(category)
+
+                    # Find or create entity
+                    entity_id = self._find_or_create_entity(
+                        cursor,
+                        mp_name,
+                        category,
+                        entity,
+                        declaration_date
                     )
-                    linked_count += 1
-            
+
+                    # Update disclosure with entity_id
+                    if entity_id:
+                        link_rows.append((entity_id, disclosure_id))
+
+            # Flush only after the scan has finished: same-connection writes
+            # to a table while a SELECT is still stepping over it have
+            # undefined visibility (rows can be skipped or revisited). The
+            # buffered rows are just small id tuples, so holding them all is
+            # cheap; the entity inserts above touch a different table and
+            # are safe mid-scan.
+            if link_rows:
+                cursor.executemany(LINK_DISCLOSURE_SQL, link_rows)
+                linked_count += len(link_rows)
+
             logger.info(f"Linked {linked_count} disclosures to entities")
             
-            # Update categories for all disclosures to ensure standardization
-            cursor.execute(
-                """
-                SELECT id, category, sub_category, details
-                FROM disclosures
-                """
-            )
-            
-            all_disclosures = cursor.fetchall()
+            # Update categories for the disclosures that need standardizing.
+            # temporal_type rides along here so the loop below never has to
+            # re-fetch the row it is looking at.
+            read_cursor.execute(STANDARDIZE_SCAN_SQL)
+
             updated_count = 0
-            
-            for disclosure in all_disclosures:
-                disclosure_id, category, sub_category, details = disclosure
-                
-                # Ensure category is valid
-                original_category = category
-                if category not in Categories.ALL:
-                    # Try to determine the most appropriate category
-                    matched = False
-                    
-                    # Special case mapping for common legacy categories
-                    special_mapping = {
-                        "Liabilities": Categories.LIABILITY,
-                        "Savings/Investments": Categories.ASSET,
-                        "Partnerships": Categories.MEMBERSHIP,
-                        "Directorships": Categories.MEMBERSHIP,
-                        "Other Interests": Categories.UNKNOWN
-                    }
-                    
-                    if category in special_mapping:
-                        category = special_mapping[category]
-                        matched = True
-                    else:
-                        # Try general matching
-                        for cat_name, cat_value in vars(Categories).items():
-                            if cat_name.isupper() and isinstance(cat_value, str):
-                                if category.lower() in cat_value.lower():
-                                    category = cat_value
-                                    matched = True
-                                    break
-                    
-                    if not matched:
-                        logger.warning(f"Could not match '{category}' to standard category. Using 'Unknown'.")
-                        category = Categories.UNKNOWN
-                
-                # Ensure subcategory is appropriate
-                if not sub_category or (category in Categories.ALL and sub_category not in Subcategories.MAPPING.get(category, [])):
-                    # Check if details help determine subcategory
-                    details_text = details.lower() if details else ""
-                    
-                    if category == Categories.ASSET:
-                        if "shares" in details_text or "stock" in details_text:
-                            sub_category = Subcategories.ASSET_SHARES
-                        elif "real estate" in details_text or "property" in details_text:
-                            sub_category = Subcategories.ASSET_REAL_ESTATE
-                        elif "trust" in details_text:
-                            sub_category = Subcategories.ASSET_TRUST
-                        else:
-                            sub_category = Subcategories.ASSET_OTHER
-                    elif category == Categories.LIABILITY:
-                        if "mortgage" in details_text:
-                            sub_category = Subcategories.LIABILITY_MORTGAGE
-                        elif "loan" in details_text:
-                            sub_category = Subcategories.LIABILITY_LOAN
-                        elif "credit" in details_text:
-                            sub_category = Subcategories.LIABILITY_CREDIT
-                        else:
-                            sub_category = Subcategories.LIABILITY_OTHER
-                    elif category == Categories.INCOME:
-                        if "dividend" in details_text:
-                            sub_category = Subcategories.INCOME_DIVIDEND
-                        elif "salary" in details_text or "wage" in details_text:
-                            sub_category = Subcategories.INCOME_SALARY
-                        else:
-                            sub_category = Subcategories.INCOME_OTHER
-                    elif category == Categories.MEMBERSHIP:
-                        if "director" in details_text or "board" in details_text or "professional" in details_text:
-                            sub_category = Subcategories.MEMBERSHIP_PROFESSIONAL
-                        else:
-                            sub_category = Subcategories.MEMBERSHIP_OTHER
-                    elif category == Categories.GIFT:
-                        if "ticket" in details_text and ("sport" in details_text or "entertainment" in details_text):
-                            sub_category = Subcategories.GIFT_ENTERTAINMENT
-                        elif "hospitality" in details_text or "dinner" in details_text or "lunch" in details_text:
-                            sub_category = Subcategories.GIFT_HOSPITALITY
-                        else:
-                            sub_category = Subcategories.GIFT_OTHER
-                    elif category == Categories.TRAVEL:
-                        if "flight" in details_text or "air" in details_text:
-                            sub_category = Subcategories.TRAVEL_AIR
-                        else:
-                            sub_category = Subcategories.TRAVEL_OTHER
-                    else:
-                        sub_category = "Other"
-                
-                # Set temporal type based on category
-                temporal_type = None
-                cursor.execute("SELECT temporal_type FROM disclosures WHERE id = ?", (disclosure_id,))
-                result = cursor.fetchone()
-                if result and result[0]:
-                    temporal_type = result[0]
-                
-                if not temporal_type:
-                    if category == Categories.ASSET:
-                        temporal_type = TemporalTypes.ONGOING
-                    elif category == Categories.LIABILITY:
-                        temporal_type = TemporalTypes.ONGOING
-                    elif category == Categories.INCOME:
-                        if sub_category == Subcategories.INCOME_DIVIDEND or sub_category == Subcategories.INCOME_SALARY:
-                            temporal_type = TemporalTypes.RECURRING
-                        else:
-                            temporal_type = TemporalTypes.ONE_TIME
-                    elif category == Categories.MEMBERSHIP:
-                        temporal_type = TemporalTypes.RECURRING
-                    else:  # Gift, Travel, or Unknown
-                        temporal_type = TemporalTypes.ONE_TIME
-                
-                # Update the disclosure with corrected category, subcategory, and temporal_type
-                if category != original_category or sub_category != disclosure[2] or not temporal_type:
-                    cursor.execute(
-                        """
-                        UPDATE disclosures
-                        SET category = ?, sub_category = ?, temporal_type = ?
-                        WHERE id = ?
-                        """,
-                        (category, sub_category, temporal_type, disclosure_id)
-                    )
-                    updated_count += 1
-            
+            update_rows = []
+            while rows := read_cursor.fetchmany():
+                for disclosure in rows:
+                    disclosure_id, category, sub_category, details = disclosure
+
+                    # Ensure category is valid
+                    original_category = category
+                    category = _normalize_category(category)
+
+                    # Ensure subcategory is appropriate
+                    original_sub_category = sub_category
+                    if not sub_category or (category in Categories.ALL and sub_category not in Subcategories.MAPPING.get(category, [])):
+                        # One compiled-regex pass over details decides the keyword
+                        sub_category = _infer_subcategory(category, details.lower() if details else "")
+
+                    # Update the disclosure with corrected category and subcategory
+                    if category != original_category or sub_category != original_sub_category:
+                        update_rows.append((category, sub_category, disclosure_id))
+
+            # As above: defer the writes until the scan over disclosures has
+            # been consumed completely
+            if update_rows:
+                cursor.executemany(STANDARDIZE_DISCLOSURE_SQL, update_rows)
+                updated_count += len(update_rows)
+
+            # Backfill missing temporal types in one CASE UPDATE rather than
+            # per row; it runs after the subcategory fixes above so the
+            # Income recurring/one-time split sees corrected values
+            cursor.execute(TEMPORAL_BACKFILL_SQL)
+            updated_count += cursor.rowcount
+
             conn.commit()
             logger.info(f"Updated categories for {updated_count} disclosures")
             return updated_count
@@ -1188,9 +1987,6 @@ class DatabaseHandler:
             logger.error(f"Error linking disclosures to entities: {str(e)}")
             conn.rollback()
             raise
-            
-        finally:
-            conn.close()
     
     def get_disclosure_patterns(self, mp_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -1202,147 +1998,102 @@ class DatabaseHandler:
         Returns:
             A dictionary containing pattern analysis
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_conn()
+        # Plain tuples and direct cursor iteration: no per-row dict or Row
+        # allocation, and no materialized fetchall list
         cursor = conn.cursor()
-        
+
         try:
-            # Base query
-            query = """
-                SELECT 
-                    category, 
-                    sub_category, 
-                    temporal_type, 
-                    strftime('%Y', declaration_date) as year,
-                    COUNT(*) as count
-                FROM disclosures
-                WHERE category IS NOT NULL
-            """
-            params = []
-            
-            # Add MP filter if provided
-            if mp_name:
-                query += " AND mp_name = ?"
-                params.append(mp_name)
-            
-            # Group and order
-            query += """
-                GROUP BY category, sub_category, temporal_type, year
-                ORDER BY year, category, sub_category
-            """
-            
-            cursor.execute(query, params)
-            results = [dict(row) for row in cursor.fetchall()]
-            
-            # Organize results
-            categories = {}
-            temporal_types = {}
-            yearly_trends = {}
-            
-            for row in results:
-                category = row["category"]
-                sub_category = row["sub_category"]
-                temporal_type = row["temporal_type"]
-                year = row["year"]
-                count = row["count"]
-                
-                # Categories breakdown
-                if category not in categories:
-                    categories[category] = {
-                        "total": 0,
-                        "subcategories": {}
-                    }
-                
+            # Each structure is a grouped aggregate SQLite can compute
+            # directly, so three targeted GROUP BY queries replace the old
+            # fine-grained rollup that was reassembled client-side. Result
+            # sets now scale with the number of groups, not disclosures.
+            mp_filter = " AND mp_name = ?" if mp_name else ""
+            params = [mp_name] if mp_name else []
+
+            categories = defaultdict(lambda: {"total": 0, "subcategories": Counter()})
+            cursor.execute(
+                "SELECT category, sub_category, COUNT(*) as count"
+                " FROM disclosures WHERE category IS NOT NULL" + mp_filter +
+                " GROUP BY category, sub_category",
+                params
+            )
+            for category, sub_category, count in cursor:
                 categories[category]["total"] += count
-                
                 if sub_category:
-                    if sub_category not in categories[category]["subcategories"]:
-                        categories[category]["subcategories"][sub_category] = 0
                     categories[category]["subcategories"][sub_category] += count
-                
-                # Temporal types breakdown
-                if temporal_type:
-                    if temporal_type not in temporal_types:
-                        temporal_types[temporal_type] = 0
-                    temporal_types[temporal_type] += count
-                
-                # Yearly trends
-                if year:
-                    if year not in yearly_trends:
-                        yearly_trends[year] = {
-                            "total": 0,
-                            "categories": {}
-                        }
-                    
-                    yearly_trends[year]["total"] += count
-                    
-                    if category not in yearly_trends[year]["categories"]:
-                        yearly_trends[year]["categories"][category] = 0
-                    
-                    yearly_trends[year]["categories"][category] += count
-            
-            # Get some details about persistence of items over time
+
+            cursor.execute(
+                "SELECT temporal_type, COUNT(*) as count"
+                " FROM disclosures WHERE category IS NOT NULL"
+                " AND temporal_type IS NOT NULL" + mp_filter +
+                " GROUP BY temporal_type",
+                params
+            )
+            temporal_types = Counter(dict(cursor))
+
+            yearly_trends = defaultdict(lambda: {"total": 0, "categories": Counter()})
+            cursor.execute(
+                "SELECT strftime('%Y', declaration_date) as year, category,"
+                " COUNT(*) as count"
+                " FROM disclosures WHERE category IS NOT NULL"
+                " AND declaration_date IS NOT NULL" + mp_filter +
+                " GROUP BY year, category ORDER BY year",
+                params
+            )
+            for year, category, count in cursor:
+                yearly_trends[year]["total"] += count
+                yearly_trends[year]["categories"][category] += count
+            
+            # Get some details about persistence of items over time. The
+            # entities JOIN pulls canonical_name/entity_type along with the
+            # rollup, replacing the old SELECT-per-entity loop; the inner
+            # join also drops dangling entity_ids the same way the old
+            # fetchone() check did.
             query = """
                 SELECT
-                    category,
-                    entity_id,
-                    COUNT(DISTINCT strftime('%Y', declaration_date)) as years_present
-                FROM disclosures
-                WHERE entity_id IS NOT NULL
+                    d.category,
+                    d.entity_id,
+                    e.canonical_name,
+                    e.entity_type,
+                    COUNT(DISTINCT strftime('%Y', d.declaration_date)) as years_present
+                FROM disclosures d
+                JOIN entities e ON e.id = d.entity_id
+                WHERE d.entity_id IS NOT NULL
             """
-            
+
             if mp_name:
-                query += " AND mp_name = ?"
-            
+                query += " AND d.mp_name = ?"
+
             query += """
-                GROUP BY category, entity_id
+                GROUP BY d.category, d.entity_id, e.canonical_name, e.entity_type
                 ORDER BY years_present DESC
             """
-            
+
             cursor.execute(query, params)
-            persistence_results = [dict(row) for row in cursor.fetchall()]
-            
+
             # Analyze persistence
             persistence = {
                 "long_term": [],  # Items persisting for 3+ years
                 "medium_term": [], # Items persisting for 2 years
                 "short_term": []  # Items appearing only in 1 year
             }
-            
-            for row in persistence_results:
-                entity_id = row["entity_id"]
-                years = row["years_present"]
-                category = row["category"]
-                
-                # Get entity details
-                cursor.execute(
-                    """
-                    SELECT canonical_name, entity_type
-                    FROM entities
-                    WHERE id = ?
-                    """,
-                    (entity_id,)
-                )
-                
-                entity_row = cursor.fetchone()
-                if entity_row:
-                    entity_name = entity_row["canonical_name"]
-                    entity_type = entity_row["entity_type"]
-                    
-                    item = {
-                        "entity_id": entity_id,
-                        "name": entity_name,
-                        "type": entity_type,
-                        "category": category,
-                        "years": years
-                    }
-                    
-                    if years >= 3:
-                        persistence["long_term"].append(item)
-                    elif years == 2:
-                        persistence["medium_term"].append(item)
-                    else:
-                        persistence["short_term"].append(item)
+
+            for category, entity_id, canonical_name, entity_type, years in cursor:
+                item = {
+                    "entity_id": entity_id,
+                    "name": canonical_name,
+                    "type": entity_type,
+                    "category": category,
+                    "years": years
+                }
+
+                if years >= 3:
+                    persistence["long_term"].append(item)
+                elif years == 2:
+                    persistence["medium_term"].append(item)
+                else:
+                    persistence["short_term"].append(item)
             
             return {
                 "categories": categories,
@@ -1353,7 +2104,4 @@ class DatabaseHandler:
             
         except Exception as e:
             logger.error(f"Error analyzing disclosure patterns: {str(e)}")
-            return {}
-            
-        finally:
-            conn.close() 
\ No newline at end of file
+            return {} 
\ No newline at end of file
@@ -11,8 +11,16 @@ import logging
 import json
 import sqlite3
 from typing import Dict, Any, List
+from functools import lru_cache
 from db_handler import DatabaseHandler
 
+# orjson serializes the timeline payloads several times faster than the
+# stdlib json and writes bytes directly; fall back if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,40 +28,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def analyze_mp_entities(db_path: str, mp_name: str, output_dir: str = None):
+# Directories already created this run; saves a stat/mkdir syscall pair
+# per file when looping over many outputs
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create path once per process; later calls are a set lookup.
+    """
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+
+@lru_cache(maxsize=4)
+def _get_handler(db_path: str) -> DatabaseHandler:
+    """
+    Return a shared DatabaseHandler per database path.
+
+    The module-level functions each built a fresh handler, repaying the
+    connection setup and schema checks on every call; memoizing by path
+    keeps one handler alive for the process.
+    """
+    return DatabaseHandler(db_path=db_path)
+
+
+def _dump_json(obj: Any, output_path: str) -> None:
+    """
+    Write obj to output_path as indented JSON.
+    """
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(obj, f, indent=2, default=str)
+
+def analyze_mp_entities(db_path: str, mp_name: str, output_dir: str = None, db_handler: DatabaseHandler = None):
     """
     Analyze entities for a specific MP.
-    
+
     Args:
         db_path: Path to the SQLite database file.
         mp_name: Name of the MP to analyze.
         output_dir: Directory to save the analysis results.
+        db_handler: Optional handler to reuse; defaults to the shared one.
     """
     logger.info(f"Analyzing entities for MP: {mp_name}")
-    
-    # Initialize database handler
-    db_handler = DatabaseHandler(db_path=db_path)
+
+    # Reuse the shared database handler
+    if db_handler is None:
+        db_handler = _get_handler(db_path)
     
     # Get all entities for this MP
     entities = db_handler.get_mp_entities(mp_name)
     
     logger.info(f"Found {len(entities)} entities for MP: {mp_name}")
     
-    # Analyze each entity
-    entity_timelines = []
-    for entity in entities:
-        entity_id = entity["id"]
-        entity_timeline = db_handler.get_entity_timeline(entity_id)
-        entity_timelines.append(entity_timeline)
+    # One bulk fetch instead of a timeline query pair per entity
+    entity_ids = [entity["id"] for entity in entities]
+    timelines_by_id = db_handler.get_entity_timelines_bulk(entity_ids)
+    entity_timelines = [
+        timelines_by_id.get(entity_id, {"entity": {}, "timeline": []})
+        for entity_id in entity_ids
+    ]
     
     # Save results if output directory provided
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"{mp_name.replace(' ', '_')}_entities.json")
         
-        with open(output_path, "w") as f:
-            json.dump(entity_timelines, f, indent=2)
-        
+        _dump_json(entity_timelines, output_path)
+
         logger.info(f"Saved entity analysis to: {output_path}")
     
     return entity_timelines
@@ -97,20 +145,22 @@ def analyze_entity_changes(entity_timeline: Dict[str, Any]) -> Dict[str, Any]:
         "changes": changes
     }
 
-def compare_mp_entities(db_path: str, mp_name1: str, mp_name2: str, output_dir: str = None):
+def compare_mp_entities(db_path: str, mp_name1: str, mp_name2: str, output_dir: str = None, db_handler: DatabaseHandler = None):
     """
     Compare entities between two MPs.
-    
+
     Args:
         db_path: Path to the SQLite database file.
         mp_name1: Name of the first MP.
         mp_name2: Name of the second MP.
         output_dir: Directory to save the comparison results.
+        db_handler: Optional handler to reuse; defaults to the shared one.
     """
     logger.info(f"Comparing entities between {mp_name1} and {mp_name2}")
-    
-    # Initialize database handler
-    db_handler = DatabaseHandler(db_path=db_path)
+
+    # Reuse the shared database handler
+    if db_handler is None:
+        db_handler = _get_handler(db_path)
     
     # Compare entities
     comparison = db_handler.compare_mp_entities(mp_name1, mp_name2)
@@ -128,12 +178,11 @@ def compare_mp_entities(db_path: str, mp_name1: str, mp_name2: str, output_dir:
     
     # Save results if output directory provided
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"comparison_{mp_name1.replace(' ', '_')}_{mp_name2.replace(' ', '_')}.json")
         
-        with open(output_path, "w") as f:
-            json.dump(comparison, f, indent=2)
-        
+        _dump_json(comparison, output_path)
+
         logger.info(f"Saved comparison to: {output_path}")
     
     return comparison
@@ -151,13 +200,14 @@ def main():
     
     args = parser.parse_args()
     
-    # Initialize database handler
-    db_handler = DatabaseHandler(db_path=args.db_path)
-    
+    # Initialize the shared database handler
+    db_handler = _get_handler(args.db_path)
+
     # Compare MPs
     if args.compare:
         mp_name1, mp_name2 = args.compare
-        compare_mp_entities(args.db_path, mp_name1, mp_name2, args.output_dir)
+        compare_mp_entities(args.db_path, mp_name1, mp_name2, args.output_dir,
+                            db_handler=db_handler)
     
     # Analyze specific entity
     elif args.entity_id:
@@ -179,30 +229,32 @@ def main():
         
         # Save results if output directory provided
         if args.output_dir:
-            os.makedirs(args.output_dir, exist_ok=True)
+            _ensure_dir(args.output_dir)
             output_path = os.path.join(args.output_dir, f"entity_{args.entity_id}.json")
             
-            with open(output_path, "w") as f:
-                json.dump(analysis, f, indent=2)
-            
+            _dump_json(analysis, output_path)
+
             logger.info(f"Saved entity analysis to: {output_path}")
     
     # Analyze MP entities
     elif args.mp:
-        analyze_mp_entities(args.db_path, args.mp, args.output_dir)
+        analyze_mp_entities(args.db_path, args.mp, args.output_dir,
+                            db_handler=db_handler)
     
     # List all MPs
     else:
         conn = sqlite3.connect(args.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT mp_name FROM disclosures")
-        mp_names = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        
+        # Sort in SQL and stream the rows instead of materializing the list
+        cursor.execute(
+            "SELECT DISTINCT mp_name FROM disclosures "
+            "ORDER BY mp_name COLLATE NOCASE")
+
         print("Available MPs:")
-        for mp_name in sorted(mp_names):
-            print(f"- {mp_name}")
+        for row in cursor:
+            print(f"- {row[0]}")
+        conn.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,8 +6,18 @@ import os
 import json
 import logging
 from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
 from ..db.db_handler import DatabaseHandler
 
+# orjson serializes the timeline payloads several times faster than the
+# stdlib json and writes bytes directly; fall back if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,6 +25,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Directories already created this run; saves a stat/mkdir syscall pair
+# per file when looping over many outputs
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create path once per process; later calls are a set lookup.
+    """
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+
+def _dump_json(obj: Any, output_path: str) -> None:
+    """
+    Write obj to output_path as indented JSON.
+    """
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(output_path, "w") as f:
+            json.dump(obj, f, indent=2, default=str)
+
 class EntityAnalyzer:
     """
     A class to analyze entities in parliamentary disclosures.
@@ -48,21 +84,21 @@ class EntityAnalyzer:
         
         logger.info(f"Found {len(entities)} entities for MP: {mp_name}")
         
-        # Analyze each entity
-        entity_timelines = []
-        for entity in entities:
-            entity_id = entity["id"]
-            entity_timeline = self.db_handler.get_entity_timeline(entity_id)
-            entity_timelines.append(entity_timeline)
+        # One bulk fetch instead of a timeline query pair per entity
+        entity_ids = [entity["id"] for entity in entities]
+        timelines_by_id = self.db_handler.get_entity_timelines_bulk(entity_ids)
+        entity_timelines = [
+            timelines_by_id.get(entity_id, {"entity": {}, "timeline": []})
+            for entity_id in entity_ids
+        ]
         
         # Save results if output directory provided
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
             output_path = os.path.join(output_dir, f"{mp_name.replace(' ', '_')}_entities.json")
             
-            with open(output_path, "w") as f:
-                json.dump(entity_timelines, f, indent=2)
-            
+            _dump_json(entity_timelines, output_path)
+
             logger.info(f"Saved entity analysis to: {output_path}")
         
         return entity_timelines
@@ -81,59 +117,60 @@ class EntityAnalyzer:
         entity_timeline = self.db_handler.get_entity_timeline(entity_id)
         entity = entity_timeline["entity"]
         timeline = entity_timeline["timeline"]
-        
-        # Sort timeline by declaration date
-        timeline = sorted(timeline, key=lambda x: x["declaration_date"])
-        
-        # Analyze changes
+
+        dates = sorted(record["declaration_date"] for record in timeline)
+
+        # Detect transitions column-wise: ne(shift()) flags every row whose
+        # value differs from its predecessor in one vectorized pass per
+        # column instead of a branch-heavy Python loop over row pairs
         changes = []
-        for i in range(1, len(timeline)):
-            prev = timeline[i-1]
-            curr = timeline[i]
-            
-            # Check for changes in details
-            if prev["details"] != curr["details"]:
-                changes.append({
-                    "type": "details_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["details"],
-                    "to": curr["details"]
-                })
-            
-            # Check for changes in category
-            if prev["category"] != curr["category"]:
-                changes.append({
-                    "type": "category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev["category"],
-                    "to": curr["category"]
-                })
-            
-            # Check for changes in sub_category
-            if prev.get("sub_category") != curr.get("sub_category"):
-                changes.append({
-                    "type": "sub_category_change",
-                    "date": curr["declaration_date"],
-                    "from": prev.get("sub_category"),
-                    "to": curr.get("sub_category")
-                })
-        
+        if len(timeline) > 1:
+            df = pd.DataFrame(timeline).sort_values(
+                "declaration_date", kind="stable", ignore_index=True)
+
+            frames = []
+            for column in ("details", "category", "sub_category"):
+                previous = df[column].shift()
+                # NaN != NaN in pandas, so mask out the rows where both
+                # sides are missing to keep None -> None from counting
+                mask = df[column].ne(previous) & ~(
+                    df[column].isna() & previous.isna())
+                # The first row has no predecessor
+                mask.iloc[0] = False
+                if not mask.any():
+                    continue
+                frames.append(pd.DataFrame({
+                    "type": f"{column}_change",
+                    "date": df.loc[mask, "declaration_date"],
+                    "from": previous[mask],
+                    "to": df.loc[mask, column],
+                }))
+
+            if frames:
+                # Frames share the row position as index; the stable sort
+                # restores date order while keeping the details/category/
+                # sub_category order within each row
+                combined = pd.concat(frames).sort_index(kind="stable")
+                # NaN back to None so missing values serialize as null
+                combined = combined.astype(object).where(
+                    combined.notna(), None)
+                changes = combined.to_dict("records")
+
         analysis = {
             "entity": entity,
-            "first_appearance": timeline[0]["declaration_date"] if timeline else None,
-            "last_appearance": timeline[-1]["declaration_date"] if timeline else None,
+            "first_appearance": dates[0] if dates else None,
+            "last_appearance": dates[-1] if dates else None,
             "num_appearances": len(timeline),
             "changes": changes
         }
         
         # Save results if output directory provided
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
             output_path = os.path.join(output_dir, f"entity_{entity_id}.json")
             
-            with open(output_path, "w") as f:
-                json.dump(analysis, f, indent=2)
-            
+            _dump_json(analysis, output_path)
+
             logger.info(f"Saved entity analysis to: {output_path}")
         
         return analysis
@@ -157,12 +194,11 @@ class EntityAnalyzer:
         
         # Save results if output directory provided
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
             output_path = os.path.join(output_dir, f"comparison_{mp_name1.replace(' ', '_')}_{mp_name2.replace(' ', '_')}.json")
             
-            with open(output_path, "w") as f:
-                json.dump(comparison, f, indent=2)
-            
+            _dump_json(comparison, output_path)
+
             logger.info(f"Saved comparison to: {output_path}")
         
         return comparison
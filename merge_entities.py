@@ -12,6 +12,7 @@ import argparse
 import logging
 import sqlite3
 import re
+from db_handler import connect as db_connect
 from typing import Dict, List, Tuple, Any, Optional
 
 # Configure logging
@@ -85,7 +86,7 @@ class EntityMerger:
         """
         logger.info("Finding duplicate entities")
         
-        conn = sqlite3.connect(self.db_path)
+        conn = db_connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -161,7 +162,7 @@ class EntityMerger:
         logger.info(f"Secondary entities to merge: {', '.join(secondary_ids)}")
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             # Begin transaction
@@ -249,7 +250,7 @@ class EntityMerger:
         logger.info(f"Merging entities {', '.join(entity_ids)} into {into_id}")
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             # Begin transaction
@@ -21,6 +21,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Directories already created this run; saves a stat/mkdir syscall pair
+# per file when looping over many outputs
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create path once per process; later calls are a set lookup.
+    """
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
 class EntityVisualizer:
     """
     A class to create visualizations for parliamentary disclosure entities.
@@ -93,7 +107,7 @@ class EntityVisualizer:
         plt.tight_layout()
         
         # Save the visualization
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"{mp_name.replace(' ', '_')}_entity_distribution.png")
         plt.savefig(output_path, dpi=300, bbox_inches='tight')
         plt.close()
@@ -114,50 +128,26 @@ class EntityVisualizer:
             Path to the saved visualization.
         """
         logger.info(f"Creating entity changes over time visualization for MP: {mp_name}")
-        
-        # Get entity timelines for this MP
-        entity_timelines = self.analyzer.analyze_mp_entities(mp_name)
-        
-        if not entity_timelines:
+
+        # One grouped query does the month bucketing and counting in SQL,
+        # replacing a timeline fetch per entity and a Python parsing loop
+        rows = self.db_handler.get_mp_entity_monthly_counts(mp_name)
+
+        if not rows:
             logger.warning(f"No entity timelines found for MP: {mp_name}")
             return ""
-        
-        # Prepare data for visualization
-        dates = []
-        categories = []
-        
-        for timeline in entity_timelines:
-            for disclosure in timeline["timeline"]:
-                date_str = disclosure["declaration_date"]
-                try:
-                    # Parse date string to datetime
-                    date = datetime.strptime(date_str, "%Y-%m-%d")
-                    dates.append(date)
-                    categories.append(disclosure["category"])
-                except ValueError:
-                    logger.warning(f"Invalid date format: {date_str}")
-        
-        if not dates:
-            logger.warning(f"No valid dates found for MP: {mp_name}")
-            return ""
-        
-        # Create a DataFrame for easier manipulation
-        df = pd.DataFrame({
-            'date': dates,
-            'category': categories
-        })
-        
-        # Group by date and category, count occurrences
-        df_grouped = df.groupby(['date', 'category']).size().unstack(fill_value=0)
-        
-        # Sort by date
-        df_grouped = df_grouped.sort_index()
-        
+
+        # Pivot the (month, entity_type, count) rows into one column per type
+        df = pd.DataFrame(rows, columns=["month", "entity_type", "count"])
+        df["month"] = pd.to_datetime(df["month"])
+        df_grouped = df.pivot(
+            index="month", columns="entity_type", values="count").fillna(0)
+
         # Create the visualization
         fig, ax = plt.subplots(figsize=(14, 10))
-        
+
         # Plot stacked area chart
-        df_grouped.plot(kind='area', stacked=True, alpha=0.7, ax=ax)
+        df_grouped.plot.area(stacked=True, alpha=0.7, ax=ax)
         
         ax.set_title(f'Entity Changes Over Time for {mp_name}', fontsize=16)
         ax.set_xlabel('Date', fontsize=14)
@@ -168,12 +158,12 @@ class EntityVisualizer:
         ax.xaxis.set_major_locator(mdates.YearLocator())
         
         # Add legend
-        ax.legend(title='Category', bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.legend(title='Entity Type', bbox_to_anchor=(1.05, 1), loc='upper left')
         
         plt.tight_layout()
         
         # Save the visualization
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"{mp_name.replace(' ', '_')}_entity_changes_over_time.png")
         plt.savefig(output_path, dpi=300, bbox_inches='tight')
         plt.close()
@@ -256,7 +246,7 @@ class EntityVisualizer:
         plt.tight_layout()
         
         # Save the visualization
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
         output_path = os.path.join(output_dir, f"comparison_{mp_name1.replace(' ', '_')}_{mp_name2.replace(' ', '_')}.png")
         plt.savefig(output_path, dpi=300, bbox_inches='tight')
         plt.close()